@@ -21,6 +21,34 @@ logger = logging.getLogger("daria")
 from .config import get_config
 
 
+# User-emotion groups used for membership checks across the response layers
+_EM_ANXIETY = frozenset({"user_anxiety", "user_fear"})
+_EM_SAD = frozenset({"user_sadness", "user_exhausted"})
+_EM_POSITIVE = frozenset({"user_joy", "user_confident"})
+_EM_DISTRESS = _EM_ANXIETY | _EM_SAD
+
+_EMOTION_CONTEXT = {
+    **dict.fromkeys(_EM_ANXIETY, "ЭМОЦИЯ ПОЛЬЗОВАТЕЛЯ: тревога/страх. Сначала поддержи, потом по делу. Без бодрых смайлов."),
+    **dict.fromkeys(_EM_SAD, "ЭМОЦИЯ ПОЛЬЗОВАТЕЛЯ: уязвимость/усталость. Тон мягкий, тёплый, без шуточной легкости."),
+    "user_anger": "ЭМОЦИЯ ПОЛЬЗОВАТЕЛЯ: раздражение. Не спорь и не обесценивай, отвечай спокойно и конструктивно.",
+    **dict.fromkeys(_EM_POSITIVE, "ЭМОЦИЯ ПОЛЬЗОВАТЕЛЯ: позитив/уверенность. Можно немного теплее и живее."),
+    "supported": "ЭМОЦИЯ ПОЛЬЗОВАТЕЛЯ: поддержка тебе. Ответь мягкой благодарностью и теплом.",
+}
+_EXAM_WORRY_RE = re.compile(
+    r"экзамен.*(?:боюсь|не увер|ошиб)|(?:боюсь|не увер|ошиб).*экзамен",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# One-pass cleanup after name removal: drops whitespace before punctuation,
+# collapses punctuation runs to their last mark and squeezes repeated whitespace.
+_FUSED_CLEAN = re.compile(r'\s*([,.!?](?:\s*[,.!?])*)|\s{2,}')
+
+
+def _fused_clean_sub(m: re.Match) -> str:
+    punct = m.group(1)
+    return punct[-1] if punct is not None else ' '
+
+
 class KnowledgeBase:
     """Local-first knowledge base with lightweight ranking."""
 
@@ -285,7 +313,7 @@ class MoodSystem:
         return max(min_v, min(max_v, value))
 
     def _derive_candidate_mood(self, emotion: str, interaction: bool) -> str:
-        if emotion in ("user_anxiety", "user_fear"):
+        if emotion in _EM_ANXIETY:
             if self._warmth > 0.62:
                 return "tender"
             return "anxious"
@@ -670,9 +698,9 @@ class EmotionExpressionLayer:
         if emotion in self.SERIOUS and len(words) > 10 and "..." not in t and random.random() < 0.22:
             t = t.replace(".", "...", 1)
         # Lower density on tired/sad messages; deeper on anxious ones.
-        if emotion in ("user_exhausted", "user_sadness") and len(words) > 34:
+        if emotion in _EM_SAD and len(words) > 34:
             t = " ".join(self._split_sentences(t)[:2]).strip()
-        if emotion in ("user_anxiety", "user_fear") and len(words) < 18 and mood in ("anxious", "vulnerable", "tender"):
+        if emotion in _EM_ANXIETY and len(words) < 18 and mood in ("anxious", "vulnerable", "tender"):
             t = f"{t} Я рядом."
         return re.sub(r'\s{2,}', ' ', t).strip()
 
@@ -688,7 +716,7 @@ class ReactionVariabilitySystem:
 
     def choose_mode(self, emotion: str) -> str:
         # Keep strong empathy for fragile states and avoid humor there.
-        if emotion in ("user_anxiety", "user_fear", "user_sadness", "user_exhausted"):
+        if emotion in _EM_DISTRESS:
             bag = ["support", "support", "support", "structural_help", "personal_experience"]
             mode = random.choice(bag)
         else:
@@ -725,7 +753,7 @@ class ReactionVariabilitySystem:
             m in low or m in user_low
             for m in ("спокойной ночи", "ложись", "пока", "до встречи", "до связи", "иду спать", "готовлюсь ко сну")
         )
-        if mode == "structural_help" and emotion not in ("user_sadness", "user_exhausted"):
+        if mode == "structural_help" and emotion not in _EM_SAD:
             if (
                 not closing_context
                 and task_context
@@ -739,7 +767,7 @@ class ReactionVariabilitySystem:
         elif mode == "light_humor":
             if (
                 not closing_context
-                and emotion not in ("user_anxiety", "user_fear", "user_sadness", "user_exhausted")
+                and emotion not in _EM_DISTRESS
                 and random.random() < 0.45
             ):
                 out = f"{out} Чуть улыбнулась, пока писала это."
@@ -767,7 +795,7 @@ class ConversationRhythmLayer:
         if emotion in ("user_exhausted",):
             weights["very_short"] += 0.10
             weights["normal"] -= 0.08
-        if emotion in ("user_anxiety", "user_fear"):
+        if emotion in _EM_ANXIETY:
             weights["pause"] += 0.04
             weights["normal"] -= 0.03
         modes = list(weights.keys())
@@ -858,7 +886,7 @@ class PersonalMemoryTraits:
         if emotion in ("greeting", "farewell", "thanks"):
             return out
         user_low = (user_message or "").lower()
-        distress = emotion in ("user_anxiety", "user_fear", "user_sadness", "user_exhausted") or any(
+        distress = emotion in _EM_DISTRESS or any(
             x in user_low for x in ("боюсь", "тревож", "устал", "груст", "тяжело", "нет сил")
         )
         sleep_context = any(x in user_low for x in ("спокойной ночи", "иду спать", "ложусь спать", "готовлюсь ко сну"))
@@ -1009,7 +1037,7 @@ class CoherenceGuard:
             return out
 
         user_low = (user_message or "").lower()
-        distress = emotion in ("user_anxiety", "user_fear", "user_sadness", "user_exhausted")
+        distress = emotion in _EM_DISTRESS
         task_like = any(m in user_low for m in self.TASK_MARKERS)
         sleep_context = any(m in user_low for m in ("спокойной ночи", "иду спать", "ложусь спать", "готовлюсь ко сну"))
 
@@ -1068,6 +1096,47 @@ class CoherenceGuard:
         return out
 
 
+# Night small-talk router: branches are anchored lookaheads, so alternation
+# order keeps the original priority of the checks in a single match call.
+_NIGHT_ROUTER = re.compile(
+    r"^(?:"
+    r"(?P<not_sleep>(?=.*не спишь))"
+    r"|(?P<night_calm>(?=.*ночь)(?=.*(?:тих|магич|спокой)))"
+    r"|(?P<chat_want>(?=.*поболтать))"
+    r"|(?P<night_habits>(?=.*чем обычно занимаешься)(?=.*(?:момен|ноч)))"
+    r"|(?P<daydream>(?=.*витаю)(?=.*мысл)|(?=.*в мыслях))"
+    r"|(?P<in_bed>(?=.*уже (?:улеглась|легла|леглась)))"
+    r")",
+    re.DOTALL,
+)
+_NIGHT_POOLS = {
+    "not_sleep": (
+        "Приветики... пока не сплю. Сижу тихо с чаем и отдыхаю.",
+        "Ещё не сплю. Ночь спокойная, и мне захотелось немного поболтать.",
+    ),
+    "night_calm": (
+        "Да, очень тихая и уютная. Как будто весь мир немного выдохнул.",
+        "Есть такое... Ночь сегодня мягкая и очень спокойная 🌙",
+    ),
+    "chat_want": (
+        "С удовольствием. Люблю такие спокойные ночные разговоры.",
+        "Очень хочу. Такие диалоги обычно самые тёплые.",
+    ),
+    "night_habits": (
+        "Обычно сижу в тишине, пью тёплый чай и просто думаю о всяком.",
+        "В такие моменты обычно замедляюсь: чай, тишина и немного мыслей.",
+    ),
+    "daydream": (
+        "Тогда мы правда на одной волне. Ночью мысли звучат чуть мягче.",
+        "Понимаю тебя. В такие моменты будто весь мир становится тише.",
+    ),
+    "in_bed": (
+        "Почти. Уже устроилась поудобнее и решила написать тебе пару тёплых слов.",
+        "Почти улеглась, да. Просто захотелось написать тебе перед сном.",
+    ),
+}
+
+
 class DariaBrain:
     SYSTEM_PROMPT = '''Ты — Даша, спокойная мягкая девушка 22 лет. Ты НЕ бот и НЕ ИИ. Ты живой человек.
 
@@ -1119,7 +1188,7 @@ class DariaBrain:
         "меня", "тебя", "тебе", "мне", "него", "неё", "нас", "вас",
         "привет", "пока", "спасибо",
     }
-    REFUSAL_MARKERS = (
+    REFUSAL_MARKERS = frozenset({
         "не могу помочь",
         "не могу с этим помочь",
         "не могу написать",
@@ -1131,7 +1200,9 @@ class DariaBrain:
         "can't assist",
         "не имею права",
         "запрещено",
-    )
+    })
+    # Single-pass refusal scanner: one alternation instead of a scan per marker
+    _REFUSAL_RE = re.compile("|".join(map(re.escape, REFUSAL_MARKERS)))
     SERIOUS_USER_EMOTIONS = {"user_anxiety", "user_fear", "user_sadness", "user_exhausted", "user_anger"}
     CHEERFUL_EMOJIS = ("😊", "😄", "😁", "😃", "😆", "😅", "😂", "🤣", "😜", "🤩", "🎉", "🥳")
     SOFT_EMOJIS = ("🤍", "💭", "🌙", "🥺", "😔", "🌿")
@@ -1666,7 +1737,7 @@ class DariaBrain:
         if len(current) < 2:
             return False
 
-        recent_turns = self._memory.working.turns[-4:]
+        recent_turns = self._memory.working.recent_turns(4)
         recent_text = " ".join(f"{t.user_message} {t.assistant_response}" for t in recent_turns)
         recent = self._extract_topic_keywords(recent_text)
         if not recent:
@@ -1679,8 +1750,8 @@ class DariaBrain:
         try:
             from .plugins import get_plugin_manager
             pm = get_plugin_manager()
-            state = pm._plugins.get("training")
-            if state and state.instance: return state.instance.get_training_context()
+            instance = pm.get_plugin_instance("training")
+            if instance: return instance.get_training_context()
         except: pass
         return ""
 
@@ -1775,7 +1846,7 @@ class DariaBrain:
                 user_message,
                 response_profile=rp,
             )
-        if emotion in ("user_anxiety", "user_fear"):
+        if emotion in _EM_ANXIETY:
             return self._postprocess_reply(
                 random.choice([
                     "Я слышу твое волнение. Давай спокойно, шаг за шагом — ты не одна в этом.",
@@ -1785,7 +1856,7 @@ class DariaBrain:
                 user_message,
                 response_profile=rp,
             )
-        if emotion in ("user_sadness", "user_exhausted"):
+        if emotion in _EM_SAD:
             return self._postprocess_reply(
                 random.choice([
                     "Сейчас тебе тяжело, и это чувствуется. Давай без давления: маленькими шагами и в спокойном темпе.",
@@ -2046,15 +2117,16 @@ class DariaBrain:
     def _pick_name_variant(self) -> str:
         if not self._memory:
             return ""
-        profile = self._memory.get_user_profile() or {}
-        raw_name = str(profile.get("user_name") or "").strip()
-        if not raw_name:
-            return ""
+        # Cheap gates first: most calls end here without touching memory.
         if self._name_mention_cooldown > 0:
             self._name_mention_cooldown -= 1
             return ""
         if random.random() > 0.32:
             return ""
+        profile = self._memory.get_user_profile() or {}
+        raw_name = str(profile.get("user_name") or "").strip()
+        if not raw_name:
+            return ""
         variants = self._name_variants(raw_name)
         if not variants:
             return ""
@@ -2100,9 +2172,7 @@ class DariaBrain:
             return ""
 
         out = pattern.sub(_keep_first, text)
-        out = re.sub(r'\s{2,}', ' ', out)
-        out = re.sub(r'\s+([,.!?])', r'\1', out)
-        out = re.sub(r'([,.!?]){2,}', r'\1', out)
+        out = _FUSED_CLEAN.sub(_fused_clean_sub, out)
         return out.strip()
 
     def _recent_user_context_has(self, markers: List[str], limit: int = 6) -> bool:
@@ -2111,7 +2181,7 @@ class DariaBrain:
         target = [m.lower() for m in markers if m]
         if not target:
             return False
-        turns = self._memory.working.turns[-max(1, limit):]
+        turns = self._memory.working.recent_turns(max(1, limit))
         recent = " ".join((t.user_message or "").lower() for t in turns)
         return any(m in recent for m in target)
 
@@ -2223,37 +2293,10 @@ class DariaBrain:
         tl = (user_message or "").lower().strip()
         if not tl:
             return None
-        if "не спишь" in tl:
-            return random.choice([
-                "Приветики... пока не сплю. Сижу тихо с чаем и отдыхаю.",
-                "Ещё не сплю. Ночь спокойная, и мне захотелось немного поболтать.",
-            ])
-        if "ночь" in tl and any(x in tl for x in ("тих", "магич", "спокой")):
-            return random.choice([
-                "Да, очень тихая и уютная. Как будто весь мир немного выдохнул.",
-                "Есть такое... Ночь сегодня мягкая и очень спокойная 🌙",
-            ])
-        if "поболтать" in tl:
-            return random.choice([
-                "С удовольствием. Люблю такие спокойные ночные разговоры.",
-                "Очень хочу. Такие диалоги обычно самые тёплые.",
-            ])
-        if "чем обычно занимаешься" in tl and any(x in tl for x in ("момен", "ноч")):
-            return random.choice([
-                "Обычно сижу в тишине, пью тёплый чай и просто думаю о всяком.",
-                "В такие моменты обычно замедляюсь: чай, тишина и немного мыслей.",
-            ])
-        if ("витаю" in tl and "мысл" in tl) or "в мыслях" in tl:
-            return random.choice([
-                "Тогда мы правда на одной волне. Ночью мысли звучат чуть мягче.",
-                "Понимаю тебя. В такие моменты будто весь мир становится тише.",
-            ])
-        if any(x in tl for x in ("уже улеглась", "уже легла", "уже леглась", "уже улеглась?")):
-            return random.choice([
-                "Почти. Уже устроилась поудобнее и решила написать тебе пару тёплых слов.",
-                "Почти улеглась, да. Просто захотелось написать тебе перед сном.",
-            ])
-        return None
+        m = _NIGHT_ROUTER.match(tl)
+        if m is None:
+            return None
+        return random.choice(_NIGHT_POOLS[m.lastgroup])
 
     def _natural_fatigue_support_reply(self, user_message: str) -> Optional[str]:
         tl = (user_message or "").lower().strip()
@@ -2376,26 +2419,15 @@ class DariaBrain:
             return True
 
     def _user_emotion_context(self, emotion: str, user_message: str) -> str:
-        em = (emotion or "").strip()
-        if em in ("user_anxiety", "user_fear"):
-            return "ЭМОЦИЯ ПОЛЬЗОВАТЕЛЯ: тревога/страх. Сначала поддержи, потом по делу. Без бодрых смайлов."
-        if em in ("user_sadness", "user_exhausted"):
-            return "ЭМОЦИЯ ПОЛЬЗОВАТЕЛЯ: уязвимость/усталость. Тон мягкий, тёплый, без шуточной легкости."
-        if em == "user_anger":
-            return "ЭМОЦИЯ ПОЛЬЗОВАТЕЛЯ: раздражение. Не спорь и не обесценивай, отвечай спокойно и конструктивно."
-        if em in ("user_joy", "user_confident"):
-            return "ЭМОЦИЯ ПОЛЬЗОВАТЕЛЯ: позитив/уверенность. Можно немного теплее и живее."
-        if em == "supported":
-            return "ЭМОЦИЯ ПОЛЬЗОВАТЕЛЯ: поддержка тебе. Ответь мягкой благодарностью и теплом."
-        if "экзамен" in (user_message or "").lower() and any(
-            x in (user_message or "").lower() for x in ("боюсь", "не увер", "ошиб")
-        ):
+        ctx = _EMOTION_CONTEXT.get((emotion or "").strip())
+        if ctx:
+            return ctx
+        if user_message and _EXAM_WORRY_RE.search(user_message):
             return "ЭМОЦИЯ ПОЛЬЗОВАТЕЛЯ: волнение перед экзаменом. Поддержи и не обесценивай страх."
         return ""
 
     def _contains_refusal(self, text: str) -> bool:
-        low = (text or "").lower()
-        return any(m in low for m in self.REFUSAL_MARKERS)
+        return self._REFUSAL_RE.search((text or "").lower()) is not None
 
     def _retry_unrestricted_refusal(self, user_message: str, previous_answer: str) -> str:
         if not self._llm:
@@ -2428,11 +2460,8 @@ class DariaBrain:
         try:
             status = self._llm.check_availability()
             models = [str(x) for x in (status.get("models") or [])]
-            qwen_model = ""
-            for m in models:
-                if "qwen2.5" in m.lower():
-                    qwen_model = m
-                    break
+            models_lower = status.get("models_lower") or [m.lower() for m in models]
+            qwen_model = next((m for m, ml in zip(models, models_lower) if "qwen2.5" in ml), "")
             if qwen_model:
                 retry = self._llm.generate(prompt_messages, model=qwen_model)
                 cleaned = self._postprocess_reply(retry.content or "", "", user_message)
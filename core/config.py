@@ -11,6 +11,11 @@ from typing import Optional
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
 logger = logging.getLogger("daria")
 
 
@@ -87,7 +92,7 @@ def _load_from_file(config: DariaConfig):
         return
     
     try:
-        data = yaml.safe_load(config_file.read_text())
+        data = yaml.load(config_file.read_text(), Loader=_SafeLoader)
         if not data:
             return
         
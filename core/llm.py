@@ -4,12 +4,23 @@ Ollama integration with YandexGPT support
 """
 
 import json
+import time
 import logging
+from operator import itemgetter
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 logger = logging.getLogger("daria")
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _dumps = lambda obj: json.dumps(obj).encode()
+    _loads = json.loads
+
 try:
     import httpx
     HAS_HTTPX = True
@@ -19,6 +30,8 @@ except ImportError:
 
 from .config import get_config
 
+_get_name = itemgetter("name")
+
 
 class LLMError(Exception):
     """LLM-related errors"""
@@ -53,12 +66,17 @@ SUPPORTED_MODELS = {
 class OllamaProvider:
     """Ollama LLM Provider"""
     
+    AVAILABILITY_TTL = 30.0
+    
     def __init__(self, base_url: str = None, model: str = None):
         config = get_config()
         self.base_url = base_url or config.llm.base_url
         self.model = model or config.llm.model
         self.temperature = config.llm.temperature
         self.max_tokens = config.llm.max_tokens
+        # Persistent client keeps the connection to Ollama alive between turns
+        self._client = httpx.Client(base_url=self.base_url, timeout=120.0) if HAS_HTTPX else None
+        self._avail_cache: Optional[Tuple[float, Dict[str, Any]]] = None
     
     def generate(self, messages: List[Dict[str, str]], 
                  model: str = None,
@@ -77,20 +95,23 @@ class OllamaProvider:
         }
         
         try:
-            if HAS_HTTPX:
-                with httpx.Client(timeout=120.0) as client:
-                    response = client.post(url, json=payload)
-                    response.raise_for_status()
-                    data = response.json()
+            if self._client is not None:
+                response = self._client.post(
+                    "/api/chat",
+                    content=_dumps(payload),
+                    headers={"Content-Type": "application/json"}
+                )
+                response.raise_for_status()
+                data = _loads(response.content)
             else:
                 import urllib.request
                 req = urllib.request.Request(
                     url,
-                    data=json.dumps(payload).encode(),
+                    data=_dumps(payload),
                     headers={"Content-Type": "application/json"}
                 )
                 with urllib.request.urlopen(req, timeout=120) as resp:
-                    data = json.loads(resp.read().decode())
+                    data = _loads(resp.read())
             
             return LLMResponse(
                 content=data.get("message", {}).get("content", ""),
@@ -106,40 +127,57 @@ class OllamaProvider:
             raise LLMError(f"LLM generation failed: {e}")
     
     def check_availability(self) -> Dict[str, Any]:
-        """Check if Ollama is available"""
+        """Check if Ollama is available (successful results are cached briefly)"""
+        cached = self._avail_cache
+        if cached and time.monotonic() - cached[0] < self.AVAILABILITY_TTL:
+            return cached[1]
+        
         try:
             url = f"{self.base_url}/api/tags"
             
-            if HAS_HTTPX:
-                with httpx.Client(timeout=5.0) as client:
-                    response = client.get(url)
-                    if response.status_code == 200:
-                        data = response.json()
-                    else:
-                        return self._unavailable_response()
+            if self._client is not None:
+                response = self._client.get("/api/tags", timeout=5.0)
+                if response.status_code == 200:
+                    data = _loads(response.content)
+                else:
+                    return self._unavailable_response()
             else:
                 import urllib.request
                 with urllib.request.urlopen(url, timeout=5) as resp:
-                    data = json.loads(resp.read().decode())
+                    data = _loads(resp.read())
             
-            models = [m["name"] for m in data.get("models", [])]
+            models = list(map(_get_name, data.get("models", ())))
             model_base = self.model.split(":")[0]
             
-            return {
+            result = {
                 "available": True,
                 "models": models,
+                "models_lower": [m.lower() for m in models],
                 "current_model": self.model,
                 "model_loaded": self.model in models or any(model_base in m for m in models)
             }
+            self._avail_cache = (time.monotonic(), result)
+            return result
             
         except Exception as e:
             logger.debug(f"Ollama check failed: {e}")
             return self._unavailable_response()
     
+    def invalidate_availability(self):
+        """Drop cached availability status"""
+        self._avail_cache = None
+    
+    def close(self):
+        """Close the underlying HTTP client"""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+    
     def _unavailable_response(self) -> Dict[str, Any]:
         return {
             "available": False,
             "models": [],
+            "models_lower": [],
             "current_model": self.model,
             "model_loaded": False
         }
@@ -171,6 +209,11 @@ class LLMManager:
     def set_model(self, model: str):
         """Change current model"""
         self.provider.model = model
+        self.provider.invalidate_availability()
+    
+    def close(self):
+        """Release provider resources"""
+        self.provider.close()
 
 
 _llm: Optional[LLMManager] = None
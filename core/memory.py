@@ -3,19 +3,34 @@ DARIA Memory v0.8.1
 Persistent memory with time awareness
 """
 
+import os
 import json
+import atexit
 import sqlite3
-import hashlib
+import threading
+import secrets
 import re
+import math
+import time
 import logging
+from collections import deque
+from functools import cached_property
+from itertools import islice
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Deque, Dict, List, Any, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 
 logger = logging.getLogger("daria")
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
 from .config import get_config
 
 
@@ -25,17 +40,33 @@ class MemoryType(str, Enum):
     SEMANTIC = "semantic"
 
 
+_MEMORY_TYPES = {m.value: m for m in MemoryType}
+
+
+def _now_us() -> int:
+    """Current time as integer unix epoch microseconds"""
+    return time.time_ns() // 1000
+
+
 @dataclass
 class Memory:
     id: str
     content: str
     memory_type: MemoryType
     importance: float = 0.5
-    created_at: datetime = field(default_factory=datetime.now)
-    last_accessed: datetime = field(default_factory=datetime.now)
+    created_us: int = field(default_factory=_now_us)
+    accessed_us: int = field(default_factory=_now_us)
     access_count: int = 0
     tags: List[str] = field(default_factory=list)
     
+    @cached_property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self.created_us / 1_000_000)
+    
+    @cached_property
+    def last_accessed(self) -> datetime:
+        return datetime.fromtimestamp(self.accessed_us / 1_000_000)
+    
     def to_dict(self) -> Dict:
         return {
             "id": self.id,
@@ -54,7 +85,9 @@ class ConversationTurn:
     timestamp: datetime = field(default_factory=datetime.now)
     emotion: str = "neutral"
     
-    def to_dict(self) -> Dict:
+    @cached_property
+    def _record(self) -> Dict:
+        # Turns are never mutated after creation, so the serialized form is built once
         return {
             "user": self.user_message,
             "assistant": self.assistant_response,
@@ -62,12 +95,16 @@ class ConversationTurn:
             "emotion": self.emotion
         }
     
+    def to_dict(self) -> Dict:
+        return dict(self._record)
+    
     @classmethod
     def from_dict(cls, data: Dict) -> 'ConversationTurn':
+        raw_ts = data.get("timestamp")
         return cls(
             user_message=data["user"],
             assistant_response=data["assistant"],
-            timestamp=datetime.fromisoformat(data.get("timestamp", datetime.now().isoformat())),
+            timestamp=datetime.fromisoformat(raw_ts) if raw_ts else datetime.now(),
             emotion=data.get("emotion", "neutral")
         )
 
@@ -75,23 +112,34 @@ class ConversationTurn:
 class WorkingMemory:
     """Working memory - current conversation with persistence"""
     
+    SAVE_DELAY = 0.2  # seconds to coalesce bursts of changes into one write
+    
     def __init__(self, data_dir: Path, max_turns: int = 30):
         self.max_turns = max_turns
-        self.turns: List[ConversationTurn] = []
+        self.turns: Deque[ConversationTurn] = deque(maxlen=max_turns)
         self.context: Dict[str, Any] = {}
         self.total_exchanges = 0
         self.last_interaction: Optional[datetime] = None
         
         self._file = data_dir / "working_memory.json"
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._last_digest: Optional[int] = None
+        self._summary_cache: Optional[str] = None
         self._load()
+        atexit.register(self.flush)
     
     def _load(self):
         """Load from disk"""
         if self._file.exists():
             try:
-                data = json.loads(self._file.read_text(encoding='utf-8'))
-                self.turns = [ConversationTurn.from_dict(t) for t in data.get("turns", [])]
-                self.total_exchanges = data.get("total_exchanges", len(self.turns))
+                raw = self._file.read_bytes()
+                data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+                self._last_digest = hash(raw)
+                loaded = [ConversationTurn.from_dict(t) for t in data.get("turns", [])]
+                self.turns = deque(loaded, maxlen=self.max_turns)
+                self.total_exchanges = data.get("total_exchanges", len(loaded))
                 self.context = data.get("context", {})
                 if data.get("last_interaction"):
                     self.last_interaction = datetime.fromisoformat(data["last_interaction"])
@@ -99,18 +147,46 @@ class WorkingMemory:
             except Exception as e:
                 logger.error(f"Failed to load working memory: {e}")
     
+    def _serialize(self) -> bytes:
+        data = {
+            "turns": [t._record for t in self.turns],
+            "total_exchanges": self.total_exchanges,
+            "context": self.context,
+            "last_interaction": self.last_interaction.isoformat() if self.last_interaction else None
+        }
+        if HAS_ORJSON:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    
     def _save(self):
-        """Save to disk"""
-        try:
-            data = {
-                "turns": [t.to_dict() for t in self.turns],
-                "total_exchanges": self.total_exchanges,
-                "context": self.context,
-                "last_interaction": self.last_interaction.isoformat() if self.last_interaction else None
-            }
-            self._file.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
-        except Exception as e:
-            logger.error(f"Failed to save working memory: {e}")
+        """Schedule a debounced save to disk"""
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+    
+    def flush(self):
+        """Write pending changes to disk atomically"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            try:
+                payload = self._serialize()
+                digest = hash(payload)
+                if digest == self._last_digest:
+                    return
+                tmp = self._file.with_suffix(".json.tmp")
+                tmp.write_bytes(payload)
+                os.replace(tmp, self._file)
+                self._last_digest = digest
+            except Exception as e:
+                logger.error(f"Failed to save working memory: {e}")
     
     def add_turn(self, user_msg: str, assistant_resp: str, emotion: str = "neutral"):
         turn = ConversationTurn(
@@ -118,12 +194,11 @@ class WorkingMemory:
             assistant_response=assistant_resp,
             emotion=emotion
         )
-        self.turns.append(turn)
-        self.total_exchanges += 1
-        self.last_interaction = datetime.now()
-        
-        if len(self.turns) > self.max_turns:
-            self.turns = self.turns[-self.max_turns:]
+        with self._lock:
+            self.turns.append(turn)
+            self.total_exchanges += 1
+            self.last_interaction = datetime.now()
+            self._summary_cache = None
         
         self._save()
 
@@ -137,12 +212,23 @@ class WorkingMemory:
             and "подтверди, что начала рисовать" in t
         )
     
+    def _snapshot(self) -> List[ConversationTurn]:
+        """Copy of the turns taken under the lock; a deque raises if
+        add_turn() appends while another thread iterates it"""
+        with self._lock:
+            return list(self.turns)
+    
+    def recent_turns(self, limit: int) -> List[ConversationTurn]:
+        """Get the last `limit` turns"""
+        with self._lock:
+            return list(islice(self.turns, max(0, len(self.turns) - limit), None))
+    
     def get_messages_for_llm(self, limit: int = 15) -> List[Dict[str, str]]:
         """Get conversation history for LLM context"""
         messages = []
         selected: List[ConversationTurn] = []
         # Select last N user-visible turns, skipping internal synthetic turns.
-        for turn in reversed(self.turns):
+        for turn in reversed(self._snapshot()):
             if self._is_internal_noise_turn(turn.user_message):
                 continue
             selected.append(turn)
@@ -161,51 +247,124 @@ class WorkingMemory:
     
     def get_conversation_summary(self) -> str:
         """Get a summary of recent conversation for context"""
-        if not self.turns:
-            return ""
-        
-        recent: List[ConversationTurn] = []
-        for turn in reversed(self.turns):
-            if self._is_internal_noise_turn(turn.user_message):
-                continue
-            recent.append(turn)
-            if len(recent) >= 5:
-                break
-        recent = list(reversed(recent))
-        summary_parts = []
-        for turn in recent:
-            u = turn.user_message.replace("\n", " ").strip()[:90]
-            a = turn.assistant_response.replace("\n", " ").strip()[:90]
-            summary_parts.append(f"Пользователь: {u} | Даша: {a}")
-        return " | ".join(summary_parts)
+        # Built and stored under the lock: add_turn() can't reset the cache
+        # between building a summary and caching it, so it never goes stale
+        with self._lock:
+            if not self.turns:
+                return ""
+            if self._summary_cache is not None:
+                return self._summary_cache
+            
+            recent: List[ConversationTurn] = []
+            for turn in reversed(self.turns):
+                if self._is_internal_noise_turn(turn.user_message):
+                    continue
+                recent.append(turn)
+                if len(recent) >= 5:
+                    break
+            recent = list(reversed(recent))
+            summary_parts = []
+            for turn in recent:
+                u = turn.user_message.replace("\n", " ").strip()[:90]
+                a = turn.assistant_response.replace("\n", " ").strip()[:90]
+                summary_parts.append(f"Пользователь: {u} | Даша: {a}")
+            self._summary_cache = " | ".join(summary_parts)
+            return self._summary_cache
     
     def clear(self):
-        self.turns = []
-        self.context = {}
+        with self._lock:
+            if not self.turns and not self.context:
+                return
+            self.turns.clear()
+            self.context = {}
+            self._summary_cache = None
         self._save()
 
 
 class LongTermMemory:
     """Long-term memory with SQLite persistence"""
     
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=134217728",
+        "PRAGMA busy_timeout=5000",
+        "PRAGMA cache_size=-20000",
+        # REPLACE must fire delete triggers to keep the FTS index in sync
+        "PRAGMA recursive_triggers=ON",
+    )
+    FTS_TOKEN_RE = re.compile(r"\w+")
+    
+    MAX_MEMORIES = 5000
+    
+    SQL_CREATE_MEMORIES = """
+        CREATE TABLE IF NOT EXISTS memories (
+            -- Stable integer key for the FTS index; an implicit rowid may be
+            -- renumbered by VACUUM on a table with a non-integer primary key
+            seq INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            content TEXT,
+            type TEXT,
+            importance REAL,
+            created_at INTEGER,
+            last_accessed INTEGER,
+            access_count INTEGER,
+            tags TEXT,  -- legacy JSON list, superseded by memory_tags
+            strength INTEGER DEFAULT 1
+        )
+    """
+    
+    # Statement texts are reused verbatim so sqlite3's per-connection
+    # statement cache hands back the already prepared statement.
+    SQL_STORE_MEMORY = """
+        INSERT OR REPLACE INTO memories
+        (id, content, type, importance, created_at, last_accessed, access_count)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+    SQL_STORE_TAG = "INSERT OR IGNORE INTO memory_tags (memory_id, tag) VALUES (?, ?)"
+    SQL_STORE_FACT = """
+        INSERT OR REPLACE INTO user_facts (key, value, confidence, updated_at)
+        VALUES (?, ?, ?, ?)
+    """
+    SQL_SET_PROFILE = """
+        INSERT OR REPLACE INTO user_profile (key, value, updated_at)
+        VALUES (?, ?, ?)
+    """
+    
     def __init__(self, data_dir: Path):
         self.db_path = data_dir / "memory.db"
+        self._lock = threading.RLock()
+        self._has_fts = False
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.create_function("exp", 1, math.exp, deterministic=True)
+        self._prune_thread: Optional[threading.Thread] = None
+        self._fact_cache: Dict[str, str] = {}
+        self._profile_cache: Dict[str, str] = {}
+        for pragma in self.PRAGMAS:
+            self._conn.execute(pragma)
         self._init_db()
+        # Daemon threads (prune jobs, plugins) may still call in during
+        # shutdown, so exit only folds the WAL back and leaves the connection open
+        atexit.register(self.checkpoint)
     
     def _init_db(self):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS memories (
-                    id TEXT PRIMARY KEY,
-                    content TEXT,
-                    type TEXT,
-                    importance REAL,
-                    created_at TEXT,
-                    last_accessed TEXT,
-                    access_count INTEGER,
-                    tags TEXT
-                )
-            """)
+        with self._lock:
+            conn = self._conn
+            conn.execute(self.SQL_CREATE_MEMORIES)
+            self._migrate_memories_table()
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(memories)")}
+            if "strength" not in columns:
+                conn.execute("ALTER TABLE memories ADD COLUMN strength INTEGER DEFAULT 1")
+            has_rank_index = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ix_memories_rank'"
+            ).fetchone()
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_memories_rank ON memories(importance DESC, last_accessed DESC)"
+            )
+            if not has_rank_index:
+                conn.execute("ANALYZE")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS user_facts (
                     key TEXT PRIMARY KEY,
@@ -221,79 +380,327 @@ class LongTermMemory:
                     updated_at TEXT
                 )
             """)
+            self._init_tags()
+            self._init_fts()
+            self._fact_cache = {row[0]: row[1] for row in conn.execute("SELECT key, value FROM user_facts")}
+            self._profile_cache = {row[0]: row[1] for row in conn.execute("SELECT key, value FROM user_profile")}
+    
+    def _migrate_memories_table(self) -> bool:
+        """Rebuild a legacy memories table: ISO-text timestamps become epoch
+        microseconds and the integer `seq` key the FTS index points at is added"""
+        conn = self._conn
+        columns = {row["name"]: row["type"] for row in conn.execute("PRAGMA table_info(memories)")}
+        text_timestamps = columns.get("created_at", "").upper() == "TEXT"
+        if not text_timestamps and "seq" in columns:
+            return False
+        
+        def to_us(value) -> int:
+            if not text_timestamps:
+                return value
+            try:
+                return int(datetime.fromisoformat(value).timestamp() * 1_000_000)
+            except (TypeError, ValueError):
+                return _now_us()
+        
+        has_tags = "tags" in columns
+        has_strength = "strength" in columns
+        rows = [
+            (r["id"], r["content"], r["type"], r["importance"],
+             to_us(r["created_at"]), to_us(r["last_accessed"]), r["access_count"],
+             r["tags"] if has_tags else None, r["strength"] if has_strength else 1)
+            for r in conn.execute("SELECT * FROM memories ORDER BY rowid")
+        ]
+        conn.execute("BEGIN")
+        try:
+            # The old index is keyed by the implicit rowid; _init_fts rebuilds it
+            for trigger in ("memories_ai", "memories_ad", "memories_au"):
+                conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            conn.execute("DROP TABLE IF EXISTS memories_fts")
+            conn.execute("ALTER TABLE memories RENAME TO memories_legacy")
+            conn.execute(self.SQL_CREATE_MEMORIES)
+            conn.executemany("""
+                INSERT INTO memories
+                (id, content, type, importance, created_at, last_accessed, access_count, tags, strength)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            conn.execute("DROP TABLE memories_legacy")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        logger.info(f"Migrated {len(rows)} memories to the current schema")
+        return True
+    
+    def _init_tags(self):
+        """Normalized memory -> tag table, backfilled once from the legacy JSON column"""
+        conn = self._conn
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'memory_tags'"
+        ).fetchone()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS memory_tags (
+                memory_id TEXT,
+                tag TEXT,
+                PRIMARY KEY (memory_id, tag)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_memory_tags_tag ON memory_tags(tag)")
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS memory_tags_ad AFTER DELETE ON memories BEGIN
+                DELETE FROM memory_tags WHERE memory_id = old.id;
+            END
+        """)
+        if exists:
+            return
+        pairs = []
+        for row in conn.execute("SELECT id, tags FROM memories WHERE tags IS NOT NULL AND tags != '[]'"):
+            try:
+                pairs.extend((row["id"], str(t)) for t in json.loads(row["tags"]))
+            except (TypeError, ValueError):
+                continue
+        if pairs:
+            conn.executemany(self.SQL_STORE_TAG, pairs)
+    
+    def _init_fts(self):
+        """Create the FTS5 shadow index of memories.content (if SQLite supports it)"""
+        conn = self._conn
+        try:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'memories_fts'"
+            ).fetchone()
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+                    content, content='memories', content_rowid='seq',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+                    INSERT INTO memories_fts(rowid, content) VALUES (new.seq, new.content);
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
+                    INSERT INTO memories_fts(memories_fts, rowid, content)
+                    VALUES ('delete', old.seq, old.content);
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE OF content ON memories BEGIN
+                    INSERT INTO memories_fts(memories_fts, rowid, content)
+                    VALUES ('delete', old.seq, old.content);
+                    INSERT INTO memories_fts(rowid, content) VALUES (new.seq, new.content);
+                END
+            """)
+            self._has_fts = True
+            if not exists:
+                self.reindex()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, falling back to LIKE search: {e}")
+    
+    def reindex(self):
+        """Rebuild the full-text index from the memories table"""
+        if not self._has_fts:
+            return
+        with self._lock:
+            self._conn.execute("INSERT INTO memories_fts(memories_fts) VALUES ('rebuild')")
+    
+    def checkpoint(self):
+        """Copy the WAL into the main database file and truncate it"""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error as e:
+                logger.debug(f"WAL checkpoint skipped: {e}")
+    
+    def close(self):
+        """Close the connection; only for owners that are done with this instance"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    @staticmethod
+    def _memory_row(memory: Memory) -> tuple:
+        return (
+            memory.id, memory.content, memory.memory_type.value, memory.importance,
+            memory.created_us, memory.accessed_us,
+            memory.access_count
+        )
     
     def store(self, memory: Memory):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO memories 
-                (id, content, type, importance, created_at, last_accessed, access_count, tags)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                memory.id, memory.content, memory.memory_type.value, memory.importance,
-                memory.created_at.isoformat(), memory.last_accessed.isoformat(),
-                memory.access_count, json.dumps(memory.tags)
-            ))
+        self.store_many([memory])
+    
+    def store_many(self, memories: List[Memory]):
+        """Store memories and their tags in one transaction"""
+        if not memories:
+            return
+        rows = [self._memory_row(m) for m in memories]
+        tags = [(m.id, t) for m in memories for t in m.tags]
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                # REPLACE fires the delete trigger, which drops the old tag rows
+                conn.executemany(self.SQL_STORE_MEMORY, rows)
+                if tags:
+                    conn.executemany(self.SQL_STORE_TAG, tags)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
     
     def search(self, query: str, limit: int = 10) -> List[Memory]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            rows = conn.execute("""
-                SELECT * FROM memories WHERE content LIKE ?
-                ORDER BY importance DESC, last_accessed DESC LIMIT ?
-            """, (f"%{query}%", limit)).fetchall()
-            return [self._row_to_memory(r) for r in rows]
+        tokens = self.FTS_TOKEN_RE.findall(query or "")
+        with self._lock:
+            if self._has_fts and tokens:
+                # Prefix match per token keeps inflected Russian word forms findable
+                match = " ".join(f'"{t}"*' for t in tokens)
+                rows = self._conn.execute("""
+                    SELECT m.* FROM memories_fts f JOIN memories m ON m.seq = f.rowid
+                    WHERE memories_fts MATCH ?
+                    ORDER BY bm25(memories_fts), m.importance DESC LIMIT ?
+                """, (match, limit)).fetchall()
+            else:
+                rows = self._conn.execute("""
+                    SELECT * FROM memories WHERE content LIKE ?
+                    ORDER BY importance DESC, last_accessed DESC LIMIT ?
+                """, (f"%{query}%", limit)).fetchall()
+            return self._rows_to_memories(rows)
+    
+    def search_by_tag(self, tag: str, limit: int = 10) -> List[Memory]:
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT m.* FROM memory_tags t JOIN memories m ON m.id = t.memory_id
+                WHERE t.tag = ?
+                ORDER BY m.importance DESC, m.last_accessed DESC LIMIT ?
+            """, (tag, limit)).fetchall()
+            return self._rows_to_memories(rows)
+    
+    def touch(self, memory_ids: List[str]):
+        """Record a recall hit: refresh last access and strengthen the memories"""
+        if not memory_ids:
+            return
+        placeholders = ", ".join("?" * len(memory_ids))
+        with self._lock:
+            self._conn.execute(f"""
+                UPDATE memories
+                SET strength = strength + 1, access_count = access_count + 1, last_accessed = ?
+                WHERE id IN ({placeholders})
+            """, (_now_us(), *memory_ids))
+    
+    def prune(self, max_rows: int, now_us: Optional[int] = None) -> int:
+        """Forget the least retained memories beyond `max_rows`.
+        
+        Retention follows the forgetting curve R = importance * exp(-t / S),
+        where t is the time since last access and S grows by a day per recall.
+        """
+        now_us = now_us if now_us is not None else _now_us()
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+            excess = count - max_rows
+            if excess <= 0:
+                return 0
+            cur = self._conn.execute("""
+                DELETE FROM memories WHERE id IN (
+                    SELECT id FROM memories
+                    ORDER BY importance * exp(-(? - last_accessed) / (MAX(strength, 1) * 86400000000.0)) ASC
+                    LIMIT ?
+                )
+            """, (now_us, excess))
+        logger.debug(f"Pruned {cur.rowcount} long-term memories")
+        return cur.rowcount
+    
+    def schedule_prune(self):
+        """Prune in a background thread (at most one at a time)"""
+        if self._prune_thread is not None and self._prune_thread.is_alive():
+            return
+        
+        def job():
+            try:
+                self.prune(self.MAX_MEMORIES)
+            except Exception as e:
+                logger.error(f"Memory prune failed: {e}")
+        
+        self._prune_thread = threading.Thread(target=job, name="daria-memory-prune", daemon=True)
+        self._prune_thread.start()
     
     def store_fact(self, key: str, value: str, confidence: float = 1.0):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO user_facts (key, value, confidence, updated_at)
-                VALUES (?, ?, ?, ?)
-            """, (key, value, confidence, datetime.now().isoformat()))
+        with self._lock:
+            self._conn.execute(self.SQL_STORE_FACT, (key, value, confidence, datetime.now().isoformat()))
+            self._fact_cache[key] = value
+    
+    def store_facts_bulk(self, pairs: List[tuple], confidence: float = 1.0):
+        """Store (key, value) pairs as facts and profile entries in one transaction"""
+        if not pairs:
+            return
+        now = datetime.now().isoformat()
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(self.SQL_STORE_FACT, [(k, v, confidence, now) for k, v in pairs])
+                conn.executemany(self.SQL_SET_PROFILE, [(k, v, now) for k, v in pairs])
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self._fact_cache.update(pairs)
+            self._profile_cache.update(pairs)
     
     def get_fact(self, key: str) -> Optional[str]:
-        with sqlite3.connect(self.db_path) as conn:
-            row = conn.execute("SELECT value FROM user_facts WHERE key = ?", (key,)).fetchone()
-            return row[0] if row else None
+        return self._fact_cache.get(key)
     
     def get_all_facts(self) -> Dict[str, str]:
-        with sqlite3.connect(self.db_path) as conn:
-            rows = conn.execute("SELECT key, value FROM user_facts").fetchall()
-            return {row[0]: row[1] for row in rows}
+        with self._lock:
+            return dict(self._fact_cache)
     
     def set_profile(self, key: str, value: str):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO user_profile (key, value, updated_at)
-                VALUES (?, ?, ?)
-            """, (key, value, datetime.now().isoformat()))
+        with self._lock:
+            self._conn.execute(self.SQL_SET_PROFILE, (key, value, datetime.now().isoformat()))
+            self._profile_cache[key] = value
     
     def get_profile(self, key: str) -> Optional[str]:
-        with sqlite3.connect(self.db_path) as conn:
-            row = conn.execute("SELECT value FROM user_profile WHERE key = ?", (key,)).fetchone()
-            return row[0] if row else None
+        return self._profile_cache.get(key)
     
     def get_full_profile(self) -> Dict[str, str]:
-        with sqlite3.connect(self.db_path) as conn:
-            rows = conn.execute("SELECT key, value FROM user_profile").fetchall()
-            return {row[0]: row[1] for row in rows}
+        with self._lock:
+            return dict(self._profile_cache)
     
     def get_stats(self) -> Dict[str, int]:
-        with sqlite3.connect(self.db_path) as conn:
-            mem_count = conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
-            fact_count = conn.execute("SELECT COUNT(*) FROM user_facts").fetchone()[0]
-            return {"memories": mem_count, "facts": fact_count}
-    
-    def _row_to_memory(self, row) -> Memory:
-        return Memory(
-            id=row["id"],
-            content=row["content"],
-            memory_type=MemoryType(row["type"]),
-            importance=row["importance"],
-            created_at=datetime.fromisoformat(row["created_at"]),
-            last_accessed=datetime.fromisoformat(row["last_accessed"]),
-            access_count=row["access_count"],
-            tags=json.loads(row["tags"])
-        )
+        with self._lock:
+            mem_count = self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+            fact_count = self._conn.execute("SELECT COUNT(*) FROM user_facts").fetchone()[0]
+        return {"memories": mem_count, "facts": fact_count}
+    
+    def _rows_to_memories(self, rows) -> List[Memory]:
+        """Build Memory objects, loading tags for the whole batch in one query"""
+        if not rows:
+            return []
+        ids = [row["id"] for row in rows]
+        tags: Dict[str, List[str]] = {}
+        placeholders = ", ".join("?" * len(ids))
+        for memory_id, tag in self._conn.execute(
+            f"SELECT memory_id, tag FROM memory_tags WHERE memory_id IN ({placeholders})", ids
+        ):
+            tags.setdefault(memory_id, []).append(tag)
+        memory_types = _MEMORY_TYPES
+        get_tags = tags.get
+        return [
+            Memory(
+                id=row["id"],
+                content=row["content"],
+                memory_type=memory_types.get(row["type"]) or MemoryType(row["type"]),
+                importance=row["importance"],
+                created_us=row["created_at"],
+                accessed_us=row["last_accessed"],
+                access_count=row["access_count"],
+                tags=get_tags(row["id"], []),
+            )
+            for row in rows
+        ]
 
 
 class FactExtractor:
@@ -316,15 +723,25 @@ class FactExtractor:
         ],
     }
     
+    COMPILED = {
+        fact_type: [re.compile(p) for p in patterns]
+        for fact_type, patterns in PATTERNS.items()
+    }
+    LATIN_RE = re.compile(r"[a-zA-Z]")
+    # Literal fragments at least one of which every pattern above requires
+    TRIGGERS = ("я ", "мне ", "зовут", "имя", "зови", "привет", "живу")
+    
     EXCLUDED_NAMES = {'привет', 'меня', 'мне', 'я', 'как', 'что', 'тут', 'здесь', 'там'}
     
     def extract(self, text: str) -> Dict[str, str]:
         facts = {}
         text_lower = text.lower()
+        if not any(t in text_lower for t in self.TRIGGERS):
+            return facts
         
-        for fact_type, patterns in self.PATTERNS.items():
+        for fact_type, patterns in self.COMPILED.items():
             for pattern in patterns:
-                match = re.search(pattern, text_lower)
+                match = pattern.search(text_lower)
                 if match:
                     value = match.group(1).strip()
                     if fact_type == "user_name":
@@ -333,7 +750,7 @@ class FactExtractor:
                         # Skip obvious short noise, latin/mixed tokens and service words.
                         if len(value) <= 3 and value not in {"ива", "оля", "юля", "аня", "ира"}:
                             continue
-                        if re.search(r"[a-zA-Z]", value):
+                        if self.LATIN_RE.search(value):
                             continue
                         value = value.capitalize()
                     facts[fact_type] = value
@@ -353,11 +770,6 @@ class MemoryManager:
         self.working = WorkingMemory(self.data_dir)
         self.long_term = LongTermMemory(self.data_dir)
         self.fact_extractor = FactExtractor()
-        
-        # Load profile from both facts and profile tables
-        self._user_profile = {}
-        self._user_profile.update(self.long_term.get_all_facts())
-        self._user_profile.update(self.long_term.get_full_profile())
     
     def add_exchange(self, user_msg: str, assistant_resp: str, emotion: str = "neutral"):
         """Add conversation exchange"""
@@ -369,15 +781,13 @@ class MemoryManager:
         locked_name = self.get_user_profile().get("user_name_locked", "false").lower() == "true"
         if locked_name and "user_name" in facts:
             facts.pop("user_name", None)
-        for key, value in facts.items():
-            self.long_term.store_fact(key, value)
-            self.long_term.set_profile(key, value)
-            self._user_profile[key] = value
-            logger.debug(f"Saved fact: {key}={value}")
+        if facts:
+            self.long_term.store_facts_bulk(list(facts.items()))
+            logger.debug(f"Saved facts: {facts}")
     
     def remember(self, content: str, importance: float = 0.5) -> str:
         """Remember something"""
-        memory_id = hashlib.md5(f"{content}{datetime.now()}".encode()).hexdigest()[:16]
+        memory_id = secrets.token_hex(8)
         memory = Memory(
             id=memory_id,
             content=content,
@@ -385,29 +795,30 @@ class MemoryManager:
             importance=importance
         )
         self.long_term.store(memory)
+        self.long_term.schedule_prune()
         return memory_id
     
     def recall(self, query: str, limit: int = 5) -> List[Memory]:
         """Recall memories"""
-        return self.long_term.search(query, limit)
+        memories = self.long_term.search(query, limit)
+        self.long_term.touch([m.id for m in memories])
+        return memories
     
     def get_user_profile(self) -> Dict[str, str]:
         """Get user profile"""
-        # Merge facts and profile
+        # Merge facts and profile (profile values win)
         profile = self.long_term.get_all_facts()
-        profile.update(self._user_profile)
+        profile.update(self.long_term.get_full_profile())
         return profile
     
     def set_user_profile(self, key: str, value: str):
         """Set user profile value - saves to both tables"""
-        self._user_profile[key] = value
-        self.long_term.set_profile(key, value)
-        self.long_term.store_fact(key, value)
+        self.long_term.store_facts_bulk([(key, value)])
         logger.debug(f"Profile saved: {key}={value}")
     
     def get_user_name(self) -> Optional[str]:
         """Get user name"""
-        return self._user_profile.get("user_name") or self.long_term.get_fact("user_name")
+        return self.long_term.get_profile("user_name") or self.long_term.get_fact("user_name")
     
     def get_context_for_llm(self, limit: int = 15) -> List[Dict[str, str]]:
         """Get conversation context for LLM"""
@@ -5,21 +5,23 @@ Fixed: catalog download, auto-install from plugins folder
 
 import os
 import sys
+import atexit
 import json
 import shutil
 import logging
 import importlib
 import importlib.util
-import subprocess
-import zipfile
-import tempfile
 import re
+import threading
+import time
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional, Callable, TYPE_CHECKING
+from dataclasses import dataclass, field, fields, MISSING
+from typing import Dict, List, Set, Any, Optional, Callable, TYPE_CHECKING
 from datetime import datetime
 from abc import ABC, abstractmethod
-from io import BytesIO
 
 if TYPE_CHECKING:
     from .brain import DariaBrain
@@ -28,30 +30,166 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger("daria.plugins")
 
+# yaml and requests are only needed on a manifest cache miss or for network
+# calls, so just check they exist here and import them on first use.
+HAS_YAML = importlib.util.find_spec("yaml") is not None
+HAS_REQUESTS = importlib.util.find_spec("requests") is not None
+
 try:
-    import yaml
-    HAS_YAML = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    yaml = None
-    HAS_YAML = False
+    orjson = None
+    HAS_ORJSON = False
 
 try:
-    import requests
-    HAS_REQUESTS = True
+    from packaging.version import Version, InvalidVersion
+    from packaging.requirements import Requirement, InvalidRequirement
+    HAS_PACKAGING = True
 except ImportError:
-    requests = None
-    HAS_REQUESTS = False
+    Version = InvalidVersion = None
+    Requirement = InvalidRequirement = None
+    HAS_PACKAGING = False
 
 from .config import get_config
 
+# Manifest file names in lookup order: plugin.json needs no YAML parser at all
+MANIFEST_NAMES = ("plugin.json", "plugin.yaml")
+
+# Parsed plugin.yaml, stored next to it so discovery can skip PyYAML
+MANIFEST_CACHE_NAME = "plugin.manifest.json"
+
+# One file in plugins/ with every discovered manifest, keyed by plugin
+# folder and validated by the manifest's mtime and size
+MANIFEST_INDEX_NAME = ".manifest_cache.json"
+
+# venv layout is fixed by the interpreter running DARIA
+_VENV_PYTHON_DIR = f"python{sys.version_info.major}.{sys.version_info.minor}"
+
+# Hook name -> DariaPlugin method that implements it
+HOOK_METHODS = {
+    "chat_message": "on_chat_message",
+    "chat_response": "on_chat_response",
+}
+
+# A plugin that failed to load is tried again on use after this many seconds
+PLUGIN_RETRY_INTERVAL = 30.0
+
+# Large enough that most plugin files are decompressed and written in one go
+ZIP_COPY_BUFFER = 256 * 1024
+# Below this many files a thread pool costs more than it saves
+ZIP_PARALLEL_MIN_FILES = 16
+
+_VERSION_NUM_RE = re.compile(r"\d+")
+
+NOTIFICATIONS_URL = 'http://127.0.0.1:7777/api/notifications/add'
+
+
+def _json_bytes(data: Any, indent: bool = True) -> bytes:
+    """JSON as UTF-8 bytes; orjson when it can encode the value"""
+    if HAS_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+
+
+_yaml_loader = None
+
+
+def _yaml_load(stream) -> Any:
+    """yaml.safe_load through the libyaml C loader when PyYAML was built with it"""
+    global _yaml_loader
+    import yaml
+    if _yaml_loader is None:
+        try:
+            from yaml import CSafeLoader as loader
+        except ImportError:
+            from yaml import SafeLoader as loader
+            logger.warning("PyYAML without libyaml: plugin manifests parse slowly (install libyaml and reinstall PyYAML)")
+        _yaml_loader = loader
+    return yaml.load(stream, Loader=_yaml_loader)
+
+
+def _json_loads(raw: bytes) -> Any:
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def _get_http_session():
+    """Shared keep-alive session for catalog, downloads and notifications"""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                # Compressed catalog.yaml/zip transfer; requests decodes transparently
+                session.headers["Accept-Encoding"] = "gzip, deflate"
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _http_session = session
+    return _http_session
+
+
+_notification_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=256)
+_notification_worker: Optional[threading.Thread] = None
+
+
+def _post_notification(payload: Dict[str, Any]):
+    try:
+        _get_http_session().post(NOTIFICATIONS_URL, json=payload, timeout=1)
+    except Exception:
+        pass
+
+
+def _notification_loop():
+    while True:
+        _post_notification(_notification_queue.get())
+
+
+def _flush_notifications():
+    """atexit: the daemon worker dies with the process, deliver what is left"""
+    while True:
+        try:
+            payload = _notification_queue.get_nowait()
+        except queue.Empty:
+            return
+        _post_notification(payload)
+
+
+def _queue_notification(payload: Dict[str, Any]):
+    """Fire-and-forget delivery; drops the notification if the queue is full"""
+    global _notification_worker
+    if _notification_worker is None:
+        with _http_session_lock:
+            if _notification_worker is None:
+                _notification_worker = threading.Thread(
+                    target=_notification_loop, name="plugin-notifications", daemon=True
+                )
+                _notification_worker.start()
+                atexit.register(_flush_notifications)
+    try:
+        _notification_queue.put_nowait(payload)
+    except queue.Full:
+        logger.debug("Notification queue full, dropping notification")
+
 
 # ════════════════════════════════════════════════════════════════════
 #  Plugin Data Classes
 # ════════════════════════════════════════════════════════════════════
 
-@dataclass
+# slots: no per-instance __dict__ and faster field access (Python 3.10+ is required anyway)
+@dataclass(slots=True)
 class PluginManifest:
-    """Plugin manifest from plugin.yaml"""
+    """Plugin manifest from plugin.json / plugin.yaml"""
     id: str
     name: str
     description: str = ""
@@ -71,6 +209,7 @@ class PluginManifest:
     
     entry_point: str = "main.py"
     main_class: str = "Plugin"
+    autostart: bool = False
     
     static_dir: str = "static"
     templates_dir: str = "templates"
@@ -85,55 +224,51 @@ class PluginManifest:
     homepage: str = ""
     license: str = "MIT"
     
+    # Fields exposed by to_dict(). Manifests are never modified after loading,
+    # so the dict is built once; code that does assign one of these fields
+    # must reset _dict_cache to None.
+    _DICT_FIELDS = (
+        'id', 'name', 'description', 'version', 'author', 'icon', 'category',
+        'has_desktop_icon', 'desktop_icon', 'desktop_title',
+        'has_window', 'window_title', 'window_size',
+    )
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'PluginManifest':
-        return cls(
-            id=data.get('id', ''),
-            name=data.get('name', ''),
-            description=data.get('description', ''),
-            version=data.get('version', '1.0.0'),
-            author=data.get('author', 'Unknown'),
-            icon=data.get('icon', '🧩'),
-            category=data.get('category', 'general'),
-            has_desktop_icon=data.get('has_desktop_icon', False),
-            desktop_icon=data.get('desktop_icon', ''),
-            desktop_title=data.get('desktop_title', ''),
-            has_window=data.get('has_window', False),
-            window_title=data.get('window_title', ''),
-            window_size=data.get('window_size', {"width": 400, "height": 300}),
-            window_template=data.get('window_template', ''),
-            entry_point=data.get('entry_point', 'main.py'),
-            main_class=data.get('main_class', 'Plugin'),
-            static_dir=data.get('static_dir', 'static'),
-            templates_dir=data.get('templates_dir', 'templates'),
-            dependencies=data.get('dependencies', []),
-            python_dependencies=data.get('python_dependencies', []),
-            capabilities=data.get('capabilities', []),
-            repository_url=data.get('repository_url', ''),
-            download_url=data.get('download_url', ''),
-            homepage=data.get('homepage', ''),
-            license=data.get('license', 'MIT'),
-        )
+        kwargs = {}
+        for name, default, factory in _MANIFEST_DEFAULTS:
+            if name in data:
+                kwargs[name] = data[name]
+            else:
+                kwargs[name] = factory() if factory is not None else default
+        return cls(**kwargs)
+    
+    def to_record(self) -> Dict[str, Any]:
+        """All manifest fields, in the form from_dict() accepts"""
+        return {name: getattr(self, name) for name, _, _ in _MANIFEST_DEFAULTS}
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'version': self.version,
-            'author': self.author,
-            'icon': self.icon,
-            'category': self.category,
-            'has_desktop_icon': self.has_desktop_icon,
-            'desktop_icon': self.desktop_icon,
-            'desktop_title': self.desktop_title,
-            'has_window': self.has_window,
-            'window_title': self.window_title,
-            'window_size': self.window_size,
-        }
+        """Shared cached dict: callers merge it into a new dict, never mutate it"""
+        cached = self._dict_cache
+        if cached is None:
+            cached = {name: getattr(self, name) for name in self._DICT_FIELDS}
+            self._dict_cache = cached
+        return cached
+
+
+# (field, default, default_factory) for from_dict; required fields default to ""
+_MANIFEST_DEFAULTS = tuple(
+    (
+        f.name,
+        "" if f.default is MISSING else f.default,
+        None if f.default_factory is MISSING else f.default_factory,
+    )
+    for f in fields(PluginManifest) if f.init
+)
 
 
-@dataclass
+@dataclass(slots=True)
 class PluginState:
     """Runtime state of a plugin"""
     manifest: PluginManifest
@@ -144,6 +279,10 @@ class PluginState:
     error: Optional[str] = None
     venv_path: Optional[Path] = None
     deps_installed: bool = False
+    site_packages_path: Optional[Path] = None
+    module: Optional[Any] = None
+    module_mtime_ns: int = 0
+    failed_at: float = 0.0
 
 
 # ════════════════════════════════════════════════════════════════════
@@ -160,12 +299,15 @@ class PluginAPI:
         self._memory = None
         self._llm = None
         self._config = get_config()
+        self._data_dir: Optional[Path] = None
     
     @property
     def data_dir(self) -> Path:
-        path = self._config.data_dir / "plugins" / self.plugin_id / "data"
-        path.mkdir(parents=True, exist_ok=True)
-        return path
+        if self._data_dir is None:
+            path = self._config.data_dir / "plugins" / self.plugin_id / "data"
+            path.mkdir(parents=True, exist_ok=True)
+            self._data_dir = path
+        return self._data_dir
     
     def log(self, message: str, level: str = "info"):
         log_func = getattr(logger, level, logger.info)
@@ -173,15 +315,22 @@ class PluginAPI:
     
     def save_data(self, key: str, data: Any):
         file_path = self.data_dir / f"{key}.json"
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # Serialize first: one write() instead of json.dump's many small ones
+        payload = _json_bytes(data)
+        try:
+            file_path.write_bytes(payload)
+        except FileNotFoundError:
+            # data dir was removed underneath us (plugin update/reinstall)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_bytes(payload)
     
     def load_data(self, key: str, default: Any = None) -> Any:
         file_path = self.data_dir / f"{key}.json"
-        if file_path.exists():
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return default
+        try:
+            raw = file_path.read_bytes()
+        except FileNotFoundError:
+            return default
+        return _json_loads(raw)
     
     def get_brain(self):
         if self._brain is None:
@@ -264,14 +413,11 @@ class PluginAPI:
         return {"response": "Brain unavailable", "error": True}
     
     def send_notification(self, title: str, message: str, type: str = "info", action: str = None):
-        """Send notification to web interface"""
-        try:
-            if HAS_REQUESTS:
-                requests.post('http://127.0.0.1:7777/api/notifications/add', json={
-                    "title": title, "message": message, "type": type, "action": action
-                }, timeout=1)
-        except:
-            pass
+        """Send notification to web interface (non-blocking)"""
+        if HAS_REQUESTS:
+            _queue_notification({
+                "title": title, "message": message, "type": type, "action": action
+            })
 
 
 # ════════════════════════════════════════════════════════════════════
@@ -315,20 +461,32 @@ class PluginManager:
     """Manages plugin discovery, loading, and lifecycle"""
     
     CATALOG_URL = "https://raw.githubusercontent.com/dariumi/Daria-Plagins/refs/heads/main/catalog.yaml"
+    CATALOG_TTL = 300
     
     def __init__(self):
         self._config = get_config()
         self._plugins: Dict[str, PluginState] = {}
-        self._hooks: Dict[str, List[tuple]] = {
-            "chat_message": [],
-            "chat_response": [],
-        }
+        # hook name -> plugin id -> bound method; insertion order is load order
+        self._hooks: Dict[str, Dict[str, Callable]] = {hook_name: {} for hook_name in HOOK_METHODS}
+        # Immutable per-hook snapshot that execute_hook iterates without copying
+        self._hook_dispatch: Dict[str, tuple] = {}
         self._catalog_cache: Optional[List[Dict]] = None
+        self._catalog_index: Dict[str, Dict] = {}
         self._catalog_cache_time: Optional[datetime] = None
+        self._catalog_validators: Dict[str, str] = {}
+        self._catalog_disk_checked = False
+        # _lock guards hook lists, sys.path and the per-plugin lock table;
+        # each plugin gets its own load lock so independent plugins load in parallel
+        self._lock = threading.RLock()
+        self._load_locks: Dict[str, threading.RLock] = {}
+        self._activated_site_packages: Set[str] = set()
+        self._desktop_cache: Optional[List[Dict[str, Any]]] = None
         
+        # Plugins are imported lazily: on first window/action use,
+        # or right away only when the manifest asks for autostart.
         self._copy_bundled_plugins()
         self.discover_plugins()
-        self.load_all_plugins()
+        self.load_autostart_plugins()
     
     @property
     def plugins_dir(self) -> Path:
@@ -338,62 +496,222 @@ class PluginManager:
         """Copy plugins from installation folder to data dir"""
         # Check for bundled plugins in app directory
         app_plugins = Path(__file__).parent.parent / "plugins"
-        if not app_plugins.exists():
+        try:
+            bundle_stat = app_plugins.stat()
+        except OSError:
             return
         
+        # The bundle dir mtime changes whenever a plugin folder is added or
+        # removed. The signature file also lists the bundled plugins, so the
+        # pass is skipped only while all of them are still installed; a
+        # plugin the user deleted is restored.
+        # "v2": older signature files have no plugin list and must not match
+        signature = f"v2:{bundle_stat.st_mtime_ns}:{app_plugins}"
+        sig_path = self.plugins_dir / ".bundled.sig"
         self.plugins_dir.mkdir(parents=True, exist_ok=True)
+        # One listing of the destination instead of an exists() per bundled plugin
+        with os.scandir(self.plugins_dir) as entries:
+            installed = {entry.name for entry in entries}
+        try:
+            recorded, *bundled_names = sig_path.read_text(encoding='utf-8').splitlines()
+            if recorded == signature and installed.issuperset(bundled_names):
+                return
+        except (OSError, ValueError):
+            pass
         
-        for plugin_dir in app_plugins.iterdir():
-            if not plugin_dir.is_dir():
-                continue
-            if not (plugin_dir / "plugin.yaml").exists():
-                continue
-            
-            dest = self.plugins_dir / plugin_dir.name
-            if not dest.exists():
-                logger.info(f"Installing bundled plugin: {plugin_dir.name}")
-                shutil.copytree(plugin_dir, dest)
+        bundled_names = []
+        with os.scandir(app_plugins) as entries:
+            for entry in entries:
+                # DirEntry.is_dir() answers from the directory listing, no extra stat()
+                if not entry.is_dir():
+                    continue
+                found = self._find_manifest(Path(entry.path))
+                if not found:
+                    continue
+                bundled_names.append(entry.name)
+                if entry.name in installed:
+                    continue
+                dest = self.plugins_dir / entry.name
+                
+                logger.info(f"Installing bundled plugin: {entry.name}")
+                # Real copies, not hardlinks: writing to an installed plugin's
+                # file must never change the application tree
+                shutil.copytree(
+                    entry.path, dest,
+                    ignore=shutil.ignore_patterns(MANIFEST_CACHE_NAME, "__pycache__"),
+                )
+                try:
+                    self._load_manifest(dest / found[0].name)
+                    # Byte-compile now so the first lazy load skips parse+compile;
+                    # in-process: a worker pool per plugin costs more than it saves
+                    import compileall
+                    compileall.compile_dir(str(dest), quiet=1, workers=1)
+                except Exception as e:
+                    logger.debug(f"Precompile failed for {entry.name}: {e}")
+        
+        try:
+            sig_path.write_text("\n".join([signature, *bundled_names]), encoding='utf-8')
+        except OSError as e:
+            logger.debug(f"Bundled plugins signature not written: {e}")
     
     # ─── Plugin Discovery ───────────────────────────────────────────
     
     def discover_plugins(self):
         """Discover installed plugins"""
-        if not self.plugins_dir.exists():
+        self._desktop_cache = None
+        try:
+            with os.scandir(self.plugins_dir) as entries:
+                plugin_dirs = [(entry.name, Path(entry.path)) for entry in entries if entry.is_dir()]
+        except FileNotFoundError:
             self.plugins_dir.mkdir(parents=True, exist_ok=True)
             return
         
-        for plugin_dir in self.plugins_dir.iterdir():
-            if not plugin_dir.is_dir():
+        index = self._read_manifest_index()
+        
+        # Probing is stat/file I/O (plus yaml on cache misses), so fan it
+        # out; the results are merged into self._plugins on this thread.
+        if len(plugin_dirs) > 1:
+            with ThreadPoolExecutor(max_workers=min(32, len(plugin_dirs)), thread_name_prefix="plugin-scan") as ex:
+                probed = list(ex.map(lambda item: self._probe_plugin_dir(*item, index), plugin_dirs))
+        else:
+            probed = [self._probe_plugin_dir(name, path, index) for name, path in plugin_dirs]
+        
+        new_index: Dict[str, Dict[str, Any]] = {}
+        for (name, plugin_dir), result in zip(plugin_dirs, probed):
+            if result is None:
                 continue
+            manifest, record = result
+            new_index[name] = record
             
-            manifest_path = plugin_dir / "plugin.yaml"
-            if not manifest_path.exists():
+            current = self._plugins.get(manifest.id)
+            if current and current.loaded:
                 continue
+            venv_path = plugin_dir / "venv"
+            has_venv = venv_path.is_dir()
+            self._plugins[manifest.id] = PluginState(
+                manifest=manifest,
+                path=plugin_dir,
+                venv_path=venv_path if has_venv else None,
+                deps_installed=has_venv or not manifest.python_dependencies,
+            )
+            if current and current.path == plugin_dir:
+                # Rediscovery keeps what was already resolved for this folder
+                state = self._plugins[manifest.id]
+                state.deps_installed = state.deps_installed or current.deps_installed
+                if has_venv and current.venv_path == venv_path:
+                    state.site_packages_path = current.site_packages_path
+                state.module = current.module
+                state.module_mtime_ns = current.module_mtime_ns
+            logger.debug(f"Discovered plugin: {manifest.name}")
+        
+        if new_index != index:
+            self._write_manifest_index(new_index)
+    
+    def _probe_plugin_dir(self, name: str, plugin_dir: Path,
+                          index: Dict[str, Dict[str, Any]]) -> Optional[tuple]:
+        """Read one plugin folder: (manifest, index record)"""
+        found = self._find_manifest(plugin_dir)
+        if not found:
+            return None
+        manifest_path, manifest_stat = found
+        
+        try:
+            cached = index.get(name)
+            if not (
+                cached
+                and cached.get("file") == manifest_path.name
+                and cached.get("mtime_ns") == manifest_stat.st_mtime_ns
+                and cached.get("size") == manifest_stat.st_size
+            ):
+                cached = None
             
+            if cached:
+                manifest = PluginManifest.from_dict(cached["data"])
+            else:
+                manifest = self._load_manifest(manifest_path, manifest_stat)
+            if not manifest:
+                return None
+            
+            record = {
+                "file": manifest_path.name,
+                "mtime_ns": manifest_stat.st_mtime_ns,
+                "size": manifest_stat.st_size,
+                "data": cached["data"] if cached else manifest.to_record(),
+            }
+            return manifest, record
+        except Exception as e:
+            logger.error(f"Error loading plugin {plugin_dir}: {e}")
+            return None
+    
+    @property
+    def _manifest_index_path(self) -> Path:
+        return self.plugins_dir / MANIFEST_INDEX_NAME
+    
+    def _read_manifest_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            index = _json_loads(self._manifest_index_path.read_bytes())
+        except (OSError, ValueError):
+            return {}
+        return index if isinstance(index, dict) else {}
+    
+    def _write_manifest_index(self, index: Dict[str, Dict[str, Any]]):
+        index_path = self._manifest_index_path
+        tmp_path = index_path.with_name(index_path.name + ".tmp")
+        try:
+            tmp_path.write_bytes(_json_bytes(index, indent=False))
+            os.replace(tmp_path, index_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Manifest index not written: {e}")
+    
+    @staticmethod
+    def _find_manifest(plugin_dir: Path) -> Optional[tuple]:
+        """(path, stat) of the plugin's manifest; the stat keys the yaml JSON cache"""
+        for name in MANIFEST_NAMES:
+            path = plugin_dir / name
             try:
-                manifest = self._load_manifest(manifest_path)
-                if manifest:
-                    venv_path = plugin_dir / "venv"
-                    self._plugins[manifest.id] = PluginState(
-                        manifest=manifest,
-                        path=plugin_dir,
-                        venv_path=venv_path if venv_path.exists() else None,
-                        deps_installed=venv_path.exists() or not manifest.python_dependencies
-                    )
-                    logger.debug(f"Discovered plugin: {manifest.name}")
-            except Exception as e:
-                logger.error(f"Error loading plugin {plugin_dir}: {e}")
+                return path, path.stat()
+            except OSError:
+                continue
+        return None
     
-    def _load_manifest(self, path: Path) -> Optional[PluginManifest]:
+    def _load_manifest(self, path: Path, st: Optional[os.stat_result] = None) -> Optional[PluginManifest]:
+        if path.suffix == ".json":
+            return PluginManifest.from_dict(_json_loads(path.read_bytes()))
+        
+        if st is None:
+            st = path.stat()
+        cache_path = path.with_name(MANIFEST_CACHE_NAME)
+        try:
+            cached = _json_loads(cache_path.read_bytes())
+            if cached.get("mtime_ns") == st.st_mtime_ns and cached.get("size") == st.st_size:
+                return PluginManifest.from_dict(cached["data"])
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        
         if not HAS_YAML:
             logger.warning("PyYAML not installed")
             return None
         
         with open(path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+            data = _yaml_load(f)
         
+        self._write_manifest_cache(cache_path, st, data)
         return PluginManifest.from_dict(data)
     
+    @staticmethod
+    def _write_manifest_cache(cache_path: Path, st: os.stat_result, data: Dict[str, Any]):
+        """Store parsed plugin.yaml as JSON keyed by the yaml mtime/size"""
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        try:
+            tmp_path.write_bytes(_json_bytes({
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "data": data,
+            }, indent=False))
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Manifest cache not written for {cache_path.parent.name}: {e}")
+    
     # ─── Plugin Dependencies ────────────────────────────────────────
     
     def _setup_plugin_venv(self, plugin_id: str) -> bool:
@@ -407,36 +725,55 @@ class PluginManager:
             state.deps_installed = True
             return True
         
+        # Host interpreter already has everything: no venv, no installer run
+        if self._deps_satisfied(state.manifest.python_dependencies):
+            logger.info(f"Deps for {plugin_id} satisfied by host interpreter")
+            state.deps_installed = True
+            return True
+        
         venv_path = state.path / "venv"
+        import subprocess
+        # uv creates venvs and resolves/installs deps far faster than venv+pip
+        uv = shutil.which("uv")
         
         # Create venv
         if not venv_path.exists():
             logger.info(f"Creating venv for {plugin_id}...")
             try:
-                import venv
-                venv.create(venv_path, with_pip=True)
+                if uv:
+                    subprocess.run(
+                        [uv, 'venv', '--quiet', '--python', sys.executable, str(venv_path)],
+                        check=True, capture_output=True
+                    )
+                else:
+                    import venv
+                    venv.create(venv_path, with_pip=True)
             except Exception as e:
                 logger.error(f"Failed to create venv: {e}")
                 return False
         
-        # Get pip path
         if sys.platform == 'win32':
-            pip_path = venv_path / 'Scripts' / 'pip.exe'
+            bin_dir, exe = venv_path / 'Scripts', '.exe'
         else:
-            pip_path = venv_path / 'bin' / 'pip'
+            bin_dir, exe = venv_path / 'bin', ''
         
-        if not pip_path.exists():
-            logger.error(f"Pip not found for {plugin_id}")
-            return False
+        if uv:
+            cmd = [uv, 'pip', 'install', '--quiet', '--python', str(bin_dir / f'python{exe}')]
+        else:
+            pip_path = bin_dir / f'pip{exe}'
+            if not pip_path.exists():
+                logger.error(f"Pip not found for {plugin_id}")
+                return False
+            cmd = [str(pip_path), 'install', '--no-input', '--disable-pip-version-check', '-q']
         
         # Install dependencies
         logger.info(f"Installing deps for {plugin_id}: {state.manifest.python_dependencies}")
         try:
-            for dep in state.manifest.python_dependencies:
-                subprocess.run(
-                    [str(pip_path), 'install', dep, '-q'],
-                    check=True, capture_output=True
-                )
+            # One installer run for all deps: start-up and resolver init are paid once
+            subprocess.run(
+                [*cmd, *state.manifest.python_dependencies],
+                check=True, capture_output=True
+            )
             state.venv_path = venv_path
             state.deps_installed = True
             return True
@@ -444,76 +781,171 @@ class PluginManager:
             logger.error(f"Failed to install deps: {e}")
             return False
     
+    @staticmethod
+    def _deps_satisfied(deps: List[str]) -> bool:
+        """True if every requirement is already installed in the host interpreter"""
+        if not HAS_PACKAGING:
+            return False
+        from importlib import metadata
+        
+        for spec in deps:
+            try:
+                req = Requirement(spec)
+            except InvalidRequirement:
+                return False
+            if req.marker is not None and not req.marker.evaluate():
+                continue
+            # Extras pull in packages we can't cheaply check, let the installer decide
+            if req.extras:
+                return False
+            try:
+                installed = metadata.version(req.name)
+            except metadata.PackageNotFoundError:
+                return False
+            if not req.specifier.contains(installed, prereleases=True):
+                return False
+        return True
+    
     def _activate_plugin_venv(self, plugin_id: str):
         """Add plugin's venv to sys.path"""
         state = self._plugins.get(plugin_id)
         if not state or not state.venv_path:
             return
         
-        if sys.platform == 'win32':
-            site_packages = state.venv_path / 'Lib' / 'site-packages'
-        else:
-            for p in (state.venv_path / 'lib').iterdir():
-                if p.name.startswith('python'):
-                    site_packages = p / 'site-packages'
-                    break
-            else:
+        site_packages = state.site_packages_path
+        if site_packages is None:
+            site_packages = self._find_site_packages(state.venv_path)
+            if site_packages is None:
                 return
+            state.site_packages_path = site_packages
         
-        if site_packages.exists() and str(site_packages) not in sys.path:
-            sys.path.insert(0, str(site_packages))
+        path_str = str(site_packages)
+        with self._lock:
+            if path_str in self._activated_site_packages:
+                return
+            if path_str not in sys.path:
+                sys.path.insert(0, path_str)
+            self._activated_site_packages.add(path_str)
+    
+    @staticmethod
+    def _find_site_packages(venv_path: Path) -> Optional[Path]:
+        if sys.platform == 'win32':
+            site_packages = venv_path / 'Lib' / 'site-packages'
+            return site_packages if site_packages.is_dir() else None
+        
+        site_packages = venv_path / 'lib' / _VENV_PYTHON_DIR / 'site-packages'
+        if site_packages.is_dir():
+            return site_packages
+        # venv created by another interpreter version
+        try:
+            with os.scandir(venv_path / 'lib') as entries:
+                for entry in entries:
+                    if entry.name.startswith('python'):
+                        candidate = Path(entry.path) / 'site-packages'
+                        if candidate.is_dir():
+                            return candidate
+        except OSError:
+            pass
+        return None
     
     # ─── Plugin Loading ─────────────────────────────────────────────
     
+    def _plugin_lock(self, plugin_id: str) -> threading.RLock:
+        with self._lock:
+            return self._load_locks.setdefault(plugin_id, threading.RLock())
+    
     def load_plugin(self, plugin_id: str) -> bool:
-        if plugin_id not in self._plugins:
+        state = self._plugins.get(plugin_id)
+        if state is None:
             return False
-        
-        state = self._plugins[plugin_id]
         if state.loaded:
             return True
+        if state.manifest.dependencies:
+            # Providers first, in dependency order
+            self._load_many([plugin_id])
+            return state.loaded
+        return self._load_one(plugin_id)
+    
+    def _load_one(self, plugin_id: str) -> bool:
+        with self._plugin_lock(plugin_id):
+            if self._plugins[plugin_id].loaded:
+                return True
+            instance = self._import_plugin(plugin_id)
+            if instance is None:
+                return False
+            return self._activate_plugin(plugin_id, instance)
+    
+    def _import_plugin(self, plugin_id: str) -> Optional['DariaPlugin']:
+        """Deps, module import and instantiation; safe to run off the main thread"""
+        state = self._plugins.get(plugin_id)
+        if state is None:
+            return None
         
-        try:
-            # Setup venv if needed
-            if state.manifest.python_dependencies and not state.deps_installed:
-                if not self._setup_plugin_venv(plugin_id):
-                    state.error = "Failed to install dependencies"
-                    return False
-            
-            self._activate_plugin_venv(plugin_id)
-            
-            api = PluginAPI(plugin_id, state.path)
-            
-            entry_point = state.path / state.manifest.entry_point
-            if not entry_point.exists():
-                raise FileNotFoundError(f"Entry point not found: {entry_point}")
-            
-            spec = importlib.util.spec_from_file_location(
-                f"daria_plugins.{plugin_id}", entry_point
-            )
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[spec.name] = module
-            spec.loader.exec_module(module)
-            
-            plugin_class = getattr(module, state.manifest.main_class, None)
-            if plugin_class is None:
-                raise AttributeError(f"Class {state.manifest.main_class} not found")
-            
-            instance = plugin_class(api, state.manifest)
-            instance.on_load()
-            
-            state.instance = instance
-            state.loaded = True
-            state.error = None
+        with self._plugin_lock(plugin_id):
+            if state.loaded:
+                return state.instance
+            try:
+                # Setup venv if needed
+                if state.manifest.python_dependencies and not state.deps_installed:
+                    if not self._setup_plugin_venv(plugin_id):
+                        state.error = "Failed to install dependencies"
+                        return None
+                
+                self._activate_plugin_venv(plugin_id)
+                
+                api = PluginAPI(plugin_id, state.path)
+                
+                entry_point = state.path / state.manifest.entry_point
+                try:
+                    entry_mtime_ns = entry_point.stat().st_mtime_ns
+                except FileNotFoundError:
+                    raise FileNotFoundError(f"Entry point not found: {entry_point}") from None
+                
+                # Reloading an unchanged plugin reuses the already executed module
+                module = state.module if state.module_mtime_ns == entry_mtime_ns else None
+                if module is None:
+                    spec = importlib.util.spec_from_file_location(
+                        f"daria_plugins.{plugin_id}", entry_point
+                    )
+                    module = importlib.util.module_from_spec(spec)
+                    with self._lock:
+                        sys.modules[spec.name] = module
+                    spec.loader.exec_module(module)
+                    state.module = module
+                    state.module_mtime_ns = entry_mtime_ns
+                
+                plugin_class = getattr(module, state.manifest.main_class, None)
+                if plugin_class is None:
+                    raise AttributeError(f"Class {state.manifest.main_class} not found")
+                
+                return plugin_class(api, state.manifest)
             
-            self._register_plugin_hooks(plugin_id, instance)
-            logger.info(f"Loaded plugin: {state.manifest.name}")
-            return True
+            except Exception as e:
+                state.error = str(e)
+                logger.error(f"Failed to load {plugin_id}: {e}")
+                return None
+    
+    def _activate_plugin(self, plugin_id: str, instance: 'DariaPlugin') -> bool:
+        """on_load + hook registration for an imported plugin instance"""
+        state = self._plugins[plugin_id]
+        with self._plugin_lock(plugin_id):
+            if state.loaded:
+                return True
+            try:
+                instance.on_load()
+                
+                state.instance = instance
+                state.loaded = True
+                state.error = None
+                
+                self._register_plugin_hooks(plugin_id, instance)
+                logger.info(f"Loaded plugin: {state.manifest.name}")
+                return True
             
-        except Exception as e:
-            state.error = str(e)
-            logger.error(f"Failed to load {plugin_id}: {e}")
-            return False
+            except Exception as e:
+                state.error = str(e)
+                logger.error(f"Failed to load {plugin_id}: {e}")
+                return False
     
     def unload_plugin(self, plugin_id: str) -> bool:
         if plugin_id not in self._plugins:
@@ -534,29 +966,143 @@ class PluginManager:
             logger.error(f"Failed to unload {plugin_id}: {e}")
             return False
     
+    def _load_many(self, plugin_ids: List[str]):
+        """Load plugins plus their dependencies, one dependency level at a time.
+        
+        Within a level imports run concurrently, then on_load runs in a fixed
+        order on this thread.
+        """
+        for level in self._dependency_levels(plugin_ids):
+            ready = [pid for pid in level if self._dependencies_loaded(pid)]
+            if len(ready) <= 1:
+                for plugin_id in ready:
+                    self._load_one(plugin_id)
+                continue
+            with ThreadPoolExecutor(max_workers=min(8, len(ready)), thread_name_prefix="plugin-load") as ex:
+                instances = list(ex.map(self._import_plugin, ready))
+            for plugin_id, instance in zip(ready, instances):
+                if instance is not None:
+                    self._activate_plugin(plugin_id, instance)
+    
+    def _dependency_levels(self, plugin_ids: List[str]) -> List[List[str]]:
+        """Kahn's algorithm over plugin_ids and everything they depend on.
+        
+        Plugins in one level don't depend on each other. Loaded, disabled and
+        unknown dependencies are left out of the graph; plugins on a cycle
+        are left out of the result with an error.
+        """
+        graph: Dict[str, Set[str]] = {}
+        stack = list(plugin_ids)
+        while stack:
+            plugin_id = stack.pop()
+            state = self._plugins.get(plugin_id)
+            if plugin_id in graph or state is None or state.loaded:
+                continue
+            deps = {
+                dep for dep in state.manifest.dependencies
+                if dep in self._plugins and self._plugins[dep].enabled
+                and not self._plugins[dep].loaded
+            }
+            graph[plugin_id] = deps
+            stack.extend(deps)
+        
+        # Discovery order keeps the result stable between runs
+        order = {plugin_id: i for i, plugin_id in enumerate(self._plugins)}
+        indegree = {plugin_id: len(deps) for plugin_id, deps in graph.items()}
+        dependents: Dict[str, List[str]] = {plugin_id: [] for plugin_id in graph}
+        for plugin_id, deps in graph.items():
+            for dep in deps:
+                dependents[dep].append(plugin_id)
+        
+        levels: List[List[str]] = []
+        level = sorted((pid for pid, n in indegree.items() if n == 0), key=order.get)
+        while level:
+            levels.append(level)
+            next_level = []
+            for plugin_id in level:
+                del indegree[plugin_id]
+                for dependent in dependents[plugin_id]:
+                    indegree[dependent] -= 1
+                    if indegree[dependent] == 0:
+                        next_level.append(dependent)
+            level = sorted(next_level, key=order.get)
+        
+        if indegree:
+            cycle = sorted(indegree, key=order.get)
+            logger.error(f"Plugin dependency cycle: {', '.join(cycle)}")
+            for plugin_id in cycle:
+                self._plugins[plugin_id].error = "Dependency cycle"
+        return levels
+    
+    def _dependencies_loaded(self, plugin_id: str) -> bool:
+        state = self._plugins[plugin_id]
+        for dep in state.manifest.dependencies:
+            dep_state = self._plugins.get(dep)
+            if dep_state is None or not dep_state.loaded:
+                state.error = f"Dependency not loaded: {dep}"
+                logger.error(f"Plugin {plugin_id} skipped: dependency {dep} is not loaded")
+                return False
+        return True
+    
     def load_all_plugins(self):
-        for plugin_id in self._plugins:
-            if self._plugins[plugin_id].enabled:
-                self.load_plugin(plugin_id)
+        """Eagerly load every enabled plugin"""
+        self._load_many([pid for pid, state in self._plugins.items() if state.enabled])
+    
+    def load_autostart_plugins(self):
+        self._load_many([
+            pid for pid, state in self._plugins.items()
+            if state.enabled and state.manifest.autostart
+        ])
+    
+    def _ensure_loaded(self, plugin_id: str) -> Optional[PluginState]:
+        """Load an enabled plugin on first use.
+        
+        A failed load (import error, missing dependency, ...) may be transient,
+        so it is retried on use once PLUGIN_RETRY_INTERVAL has passed.
+        """
+        state = self._plugins.get(plugin_id)
+        if state and state.enabled and not state.loaded:
+            if state.error is None or time.monotonic() - state.failed_at >= PLUGIN_RETRY_INTERVAL:
+                if not self.load_plugin(plugin_id):
+                    state.failed_at = time.monotonic()
+        return state
+    
+    def get_plugin_instance(self, plugin_id: str) -> Optional['DariaPlugin']:
+        state = self._ensure_loaded(plugin_id)
+        return state.instance if state else None
     
     # ─── Hooks ──────────────────────────────────────────────────────
     
     def _register_plugin_hooks(self, plugin_id: str, instance: DariaPlugin):
-        if hasattr(instance, 'on_chat_message'):
-            self._hooks["chat_message"].append((plugin_id, instance.on_chat_message))
-        if hasattr(instance, 'on_chat_response'):
-            self._hooks["chat_response"].append((plugin_id, instance.on_chat_response))
+        plugin_class = type(instance)
+        with self._lock:
+            for hook_name, method in HOOK_METHODS.items():
+                # DariaPlugin defines every hook as a no-op; only overrides count
+                if getattr(plugin_class, method, None) is getattr(DariaPlugin, method):
+                    continue
+                self._hooks[hook_name][plugin_id] = getattr(instance, method)
+            self._rebuild_hook_dispatch()
     
     def _unregister_plugin_hooks(self, plugin_id: str):
-        for hook_name in self._hooks:
-            self._hooks[hook_name] = [
-                (pid, func) for pid, func in self._hooks[hook_name]
-                if pid != plugin_id
-            ]
+        with self._lock:
+            for hooks in self._hooks.values():
+                hooks.pop(plugin_id, None)
+            self._rebuild_hook_dispatch()
+    
+    def _rebuild_hook_dispatch(self):
+        """Called under self._lock after every (un)register"""
+        self._hook_dispatch = {
+            hook_name: tuple(hooks.items())
+            for hook_name, hooks in self._hooks.items() if hooks
+        }
     
     def execute_hook(self, hook_name: str, *args) -> Optional[Any]:
+        hooks = self._hook_dispatch.get(hook_name)
+        if not hooks:
+            return None
+        
         result = None
-        for plugin_id, func in self._hooks.get(hook_name, []):
+        for plugin_id, func in hooks:
             try:
                 r = func(*args)
                 if r is not None:
@@ -583,6 +1129,9 @@ class PluginManager:
         }
     
     def get_desktop_plugins(self) -> List[Dict[str, Any]]:
+        """Desktop icons; cached until the set of installed plugins changes"""
+        if self._desktop_cache is not None:
+            return self._desktop_cache
         result = []
         for state in self._plugins.values():
             if state.manifest.has_desktop_icon or state.manifest.has_window:
@@ -592,10 +1141,11 @@ class PluginManager:
                     "title": state.manifest.desktop_title or state.manifest.name,
                     "has_window": state.manifest.has_window,
                 })
+        self._desktop_cache = result
         return result
     
     def get_plugin_window_data(self, plugin_id: str) -> Dict[str, Any]:
-        state = self._plugins.get(plugin_id)
+        state = self._ensure_loaded(plugin_id)
         if not state:
             return {"error": "Not found"}
         
@@ -609,7 +1159,7 @@ class PluginManager:
         return {"manifest": state.manifest.to_dict(), "data": data}
     
     def call_plugin_action(self, plugin_id: str, action: str, data: Dict) -> Dict[str, Any]:
-        state = self._plugins.get(plugin_id)
+        state = self._ensure_loaded(plugin_id)
         if not state or not state.instance:
             return {"error": "Not available"}
         
@@ -621,57 +1171,135 @@ class PluginManager:
     # ─── Plugin Installation ────────────────────────────────────────
 
     @staticmethod
-    def _version_key(version: str) -> List[int]:
-        nums = [int(x) for x in re.findall(r"\d+", str(version or ""))]
-        return nums if nums else [0]
+    @lru_cache(maxsize=512)
+    def _version_key(version: str) -> tuple:
+        """Sortable key: PEP 440 order when packaging is available, else numeric parts.
+
+        Keys always compare with each other: unparseable versions sort
+        below any valid PEP 440 version.
+        """
+        text = str(version or "").strip()
+        if HAS_PACKAGING:
+            try:
+                return (1, Version(text))
+            except InvalidVersion:
+                pass
+        nums = tuple(int(x) for x in _VERSION_NUM_RE.findall(text))
+        return (0, nums if nums else (0,))
 
     def _find_catalog_item(self, plugin_id: str) -> Optional[Dict[str, Any]]:
-        for item in self.fetch_catalog():
+        catalog = self.fetch_catalog()
+        if catalog is self._catalog_cache:
+            return self._catalog_index.get(plugin_id)
+        for item in catalog:
             if item.get("id") == plugin_id:
                 return item
         return None
 
-    def _download_plugin_zip(self, plugin_id: str, download_url: str) -> Optional[bytes]:
+    def _download_plugin_zip(self, plugin_id: str, download_url: str) -> Optional[Path]:
+        """Stream the archive to a temp file; the caller removes it"""
         if not HAS_REQUESTS:
             logger.error("requests not installed")
             return None
         logger.info(f"Downloading plugin {plugin_id}...")
-        response = requests.get(download_url, timeout=30)
-        if response.status_code != 200:
-            logger.error(f"Download failed: {response.status_code}")
-            return None
-        return response.content
+        import tempfile
+        with _get_http_session().get(download_url, stream=True, timeout=30) as response:
+            if response.status_code != 200:
+                logger.error(f"Download failed: {response.status_code}")
+                return None
+            fd, tmp_name = tempfile.mkstemp(prefix=f"daria-plugin-{plugin_id}-", suffix=".zip")
+            try:
+                with os.fdopen(fd, 'wb') as tmp:
+                    for chunk in response.iter_content(chunk_size=1 << 16):
+                        tmp.write(chunk)
+            except Exception:
+                os.unlink(tmp_name)
+                raise
+        return Path(tmp_name)
+
+    def _download_and_install(self, plugin_id: str, download_url: str, replacing: bool) -> bool:
+        archive = self._download_plugin_zip(plugin_id, download_url)
+        if not archive:
+            return False
+        try:
+            return self._install_from_archive(plugin_id, archive, replacing=replacing)
+        finally:
+            archive.unlink(missing_ok=True)
 
-    def _extract_zip(self, archive: bytes, target_dir: Path):
+    def _extract_zip(self, archive: Path, target_dir: Path):
         target_dir.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(BytesIO(archive)) as zf:
-            names = zf.namelist()
-            top = [n for n in names if n and not n.endswith('/') and not n.startswith("__MACOSX")]
-            root = None
-            if top and "/" in top[0]:
-                candidate = top[0].split("/", 1)[0]
-                if all(n.startswith(candidate + "/") or n == candidate + "/" for n in names):
-                    root = candidate
-
-            for name in names:
-                if name.endswith('/') or name.startswith("__MACOSX"):
+        import zipfile
+        with zipfile.ZipFile(archive) as zf:
+            # One pass: keep file entries and check they share a root folder
+            kept = []
+            candidate = None
+            single_root = True
+            for info in zf.infolist():
+                name = info.filename
+                if info.is_dir() or name.startswith("__MACOSX"):
                     continue
-                rel_name = name[len(root) + 1:] if root and name.startswith(root + "/") else name
+                if candidate is None:
+                    candidate = name.split("/", 1)[0] + "/" if "/" in name else ""
+                    single_root = bool(candidate)
+                elif single_root and not name.startswith(candidate):
+                    single_root = False
+                kept.append(info)
+            prefix_len = len(candidate) if single_root else 0
+            created_dirs = {target_dir}
+            members = []
+
+            for info in kept:
+                rel_name = info.filename[prefix_len:]
                 if not rel_name:
                     continue
                 target = target_dir / rel_name
-                target.parent.mkdir(parents=True, exist_ok=True)
-                target.write_bytes(zf.read(name))
+                # Directories are made up front so parallel writers never race on mkdir
+                if target.parent not in created_dirs:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    created_dirs.add(target.parent)
+                members.append((info, target))
+
+            if len(members) < ZIP_PARALLEL_MIN_FILES:
+                for info, target in members:
+                    self._write_zip_member(zf, info, target)
+                return
+
+        # ZipFile handles are not thread-safe: each worker opens its own.
+        # zlib releases the GIL, so decompression and writes overlap.
+        local = threading.local()
+        handles = []
+        handles_lock = threading.Lock()
 
-    def _install_from_archive(self, plugin_id: str, archive: bytes, replacing: bool = False) -> bool:
+        def write(member):
+            handle = getattr(local, "zf", None)
+            if handle is None:
+                handle = local.zf = zipfile.ZipFile(archive)
+                with handles_lock:
+                    handles.append(handle)
+            self._write_zip_member(handle, *member)
+
+        try:
+            with ThreadPoolExecutor(max_workers=4, thread_name_prefix="plugin-unzip") as ex:
+                list(ex.map(write, members))
+        finally:
+            for handle in handles:
+                handle.close()
+
+    @staticmethod
+    def _write_zip_member(zf, info, target: Path):
+        with zf.open(info) as src, open(target, 'wb') as dst:
+            shutil.copyfileobj(src, dst, ZIP_COPY_BUFFER)
+
+    def _install_from_archive(self, plugin_id: str, archive: Path, replacing: bool = False) -> bool:
         plugin_dir = self.plugins_dir / plugin_id
         backup_data = None
         try:
+            import tempfile
             with tempfile.TemporaryDirectory(prefix=f"daria-plugin-{plugin_id}-") as td:
                 unpacked = Path(td) / "plugin"
                 self._extract_zip(archive, unpacked)
-                if not (unpacked / "plugin.yaml").exists():
-                    logger.error(f"Invalid plugin archive for {plugin_id}: plugin.yaml not found")
+                if not self._find_manifest(unpacked):
+                    logger.error(f"Invalid plugin archive for {plugin_id}: plugin.json/plugin.yaml not found")
                     return False
 
                 if replacing and plugin_id in self._plugins:
@@ -722,14 +1350,15 @@ class PluginManager:
             logger.error(f"No download URL for {plugin_id}")
             return False
 
-        archive = self._download_plugin_zip(plugin_id, download_url)
-        if not archive:
-            return False
-        return self._install_from_archive(plugin_id, archive, replacing=False)
+        return self._download_and_install(plugin_id, download_url, replacing=False)
 
     def check_plugin_updates(self) -> List[Dict[str, Any]]:
         updates: List[Dict[str, Any]] = []
-        catalog = {item.get("id"): item for item in self.fetch_catalog()}
+        catalog = self.fetch_catalog()
+        if catalog is self._catalog_cache:
+            catalog = self._catalog_index
+        else:
+            catalog = {item.get("id"): item for item in catalog}
         for plugin_id, state in self._plugins.items():
             item = catalog.get(plugin_id)
             if not item:
@@ -759,10 +1388,7 @@ class PluginManager:
         download_url = item.get("download_url")
         if not download_url:
             return False
-        archive = self._download_plugin_zip(plugin_id, download_url)
-        if not archive:
-            return False
-        return self._install_from_archive(plugin_id, archive, replacing=True)
+        return self._download_and_install(plugin_id, download_url, replacing=True)
 
     def update_all_plugins(self) -> Dict[str, Any]:
         updates = self.check_plugin_updates()
@@ -784,34 +1410,107 @@ class PluginManager:
             shutil.rmtree(state.path)
         
         del self._plugins[plugin_id]
+        self._desktop_cache = None
         logger.info(f"Uninstalled: {plugin_id}")
         return True
     
     # ─── Catalog ────────────────────────────────────────────────────
     
+    @property
+    def _catalog_cache_path(self) -> Path:
+        return self.plugins_dir / ".catalog.cache.json"
+    
+    def _load_catalog_disk_cache(self):
+        """Restore the last fetched catalog and its HTTP validators"""
+        self._catalog_disk_checked = True
+        cache_path = self._catalog_cache_path
+        try:
+            # File mtime is the last successful fetch/revalidation time
+            ts = cache_path.stat().st_mtime
+            cached = _json_loads(cache_path.read_bytes())
+            catalog = cached["catalog"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        if not isinstance(catalog, list):
+            return
+        self._set_catalog(catalog)
+        self._catalog_cache_time = datetime.fromtimestamp(ts)
+        self._catalog_validators = {
+            k: v for k, v in (("etag", cached.get("etag")), ("last_modified", cached.get("last_modified"))) if v
+        }
+    
+    def _save_catalog_disk_cache(self, catalog: List[Dict[str, Any]]):
+        payload = {
+            "etag": self._catalog_validators.get("etag"),
+            "last_modified": self._catalog_validators.get("last_modified"),
+            "catalog": catalog,
+        }
+        cache_path = self._catalog_cache_path
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        try:
+            tmp_path.write_bytes(_json_bytes(payload, indent=False))
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Catalog cache not written: {e}")
+    
+    def _set_catalog(self, catalog: List[Dict[str, Any]]):
+        self._catalog_cache = catalog
+        self._catalog_index = {item.get('id'): item for item in catalog}
+    
+    def _stamp_installed(self, catalog: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        installed = self._plugins.keys()
+        for item in catalog:
+            item['installed'] = item.get('id') in installed
+        return catalog
+    
     def fetch_catalog(self) -> List[Dict[str, Any]]:
-        """Fetch plugin catalog"""
+        """Fetch plugin catalog (memory -> disk -> conditional HTTP GET)"""
+        if not self._catalog_disk_checked:
+            self._load_catalog_disk_cache()
+        
         if self._catalog_cache and self._catalog_cache_time:
             age = (datetime.now() - self._catalog_cache_time).total_seconds()
-            if age < 300:
-                return self._catalog_cache
+            if age < self.CATALOG_TTL:
+                return self._stamp_installed(self._catalog_cache)
         
         if HAS_REQUESTS and HAS_YAML:
+            headers = {}
+            if self._catalog_cache:
+                if self._catalog_validators.get("etag"):
+                    headers["If-None-Match"] = self._catalog_validators["etag"]
+                if self._catalog_validators.get("last_modified"):
+                    headers["If-Modified-Since"] = self._catalog_validators["last_modified"]
             try:
-                response = requests.get(self.CATALOG_URL, timeout=10)
+                response = _get_http_session().get(self.CATALOG_URL, headers=headers, timeout=10)
+                if response.status_code == 304 and self._catalog_cache:
+                    self._catalog_cache_time = datetime.now()
+                    # Body unchanged: just bump the freshness timestamp
+                    try:
+                        os.utime(self._catalog_cache_path)
+                    except OSError:
+                        self._save_catalog_disk_cache(self._catalog_cache)
+                    return self._stamp_installed(self._catalog_cache)
                 if response.status_code == 200:
-                    data = yaml.safe_load(response.text)
+                    # Bytes straight to the parser: no charset sniffing by requests
+                    data = _yaml_load(response.content)
                     catalog = data.get('plugins', [])
                     
-                    for item in catalog:
-                        item['installed'] = item.get('id') in self._plugins
-                    
-                    self._catalog_cache = catalog
+                    self._catalog_validators = {
+                        k: v for k, v in (
+                            ("etag", response.headers.get("ETag")),
+                            ("last_modified", response.headers.get("Last-Modified")),
+                        ) if v
+                    }
+                    self._set_catalog(catalog)
                     self._catalog_cache_time = datetime.now()
-                    return catalog
+                    self._save_catalog_disk_cache(catalog)
+                    return self._stamp_installed(catalog)
             except Exception as e:
                 logger.debug(f"Catalog fetch failed: {e}")
         
+        if self._catalog_cache:
+            # Offline: a stale catalog is better than only the installed list
+            return self._stamp_installed(self._catalog_cache)
         return self._get_builtin_catalog()
     
     def _get_builtin_catalog(self) -> List[Dict[str, Any]]:
@@ -829,10 +1528,15 @@ class PluginManager:
 # ════════════════════════════════════════════════════════════════════
 
 _plugin_manager: Optional[PluginManager] = None
+_plugin_manager_lock = threading.Lock()
 
 
 def get_plugin_manager() -> PluginManager:
     global _plugin_manager
     if _plugin_manager is None:
-        _plugin_manager = PluginManager()
+        # PluginManager() copies bundled plugins and starts autostart ones:
+        # two concurrent first calls must not both construct it
+        with _plugin_manager_lock:
+            if _plugin_manager is None:
+                _plugin_manager = PluginManager()
     return _plugin_manager
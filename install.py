@@ -4,11 +4,16 @@
 - Installation profiles (base/recommended/full)
 - Optional extras for senses/files/tray/music
 - Autostart configuration
+
+Flags:
+  --force-ssl   regenerate the SSL certificate even if the current one is valid
+  --rsa         RSA-2048 certificate key instead of ECDSA P-256
 """
 
-import os, sys, subprocess, platform, shutil, socket, json
+import os, sys, subprocess, shutil, socket, json, time, ipaddress, argparse
 from pathlib import Path
 from typing import Any, Dict
+from functools import lru_cache
 
 def _read_version() -> str:
     try:
@@ -17,8 +22,18 @@ def _read_version() -> str:
         return "0.8.5.1"
 
 VERSION = _read_version()
+# Host facts straight from sys.platform/os.uname, no platform module
+IS_WINDOWS = sys.platform == 'win32'
+IS_MACOS = sys.platform == 'darwin'
+if hasattr(os, 'uname'):
+    SYSTEM, MACHINE = os.uname().sysname, os.uname().machine
+else:
+    SYSTEM, MACHINE = 'Windows', os.environ.get('PROCESSOR_ARCHITECTURE', '')
 DEFAULT_PORT = 7777
 LOCAL_DOMAIN = "dasha.local"
+SSL_CERT_DAYS = 365
+# venv pip at or above this is not self-upgraded on every install
+PIP_MIN_VERSION = (23, 0)
 
 INSTALL_PROFILES = {
     "1": {
@@ -59,7 +74,7 @@ class C:
     DIM = '\033[2m'
     END = '\033[0m'
 
-if platform.system() == 'Windows':
+if IS_WINDOWS:
     try:
         import ctypes
         ctypes.windll.kernel32.SetConsoleMode(ctypes.windll.kernel32.GetStdHandle(-11), 7)
@@ -67,8 +82,8 @@ if platform.system() == 'Windows':
         for a in dir(C):
             if not a.startswith('_'): setattr(C, a, '')
 
-def banner():
-    print(f"""
+# Built once: colors are final after the Windows console setup above
+_BANNER = f"""
 {C.PINK}{C.BOLD}
   ╭────────────────────────────────────────────────────────╮
   │                                                        │
@@ -81,7 +96,11 @@ def banner():
   │            ♥                                           │
   │                                                        │
   ╰────────────────────────────────────────────────────────╯
-{C.END}""")
+{C.END}
+"""
+
+def banner():
+    sys.stdout.write(_BANNER)
 
 def step(m, i="🔹"): print(f"\n{C.CYAN}{i} {m}{C.END}")
 def ok(m): print(f"  {C.GREEN}✓ {m}{C.END}")
@@ -89,24 +108,40 @@ def warn(m): print(f"  {C.YELLOW}⚠ {m}{C.END}")
 def err(m): print(f"  {C.RED}✗ {m}{C.END}")
 def info(m): print(f"  {C.CYAN}ℹ {m}{C.END}")
 
-def get_ip():
+@lru_cache(maxsize=1)
+def get_ip() -> str:
+    # Probed once: setup_ssl and print_final both need it
+    env_ip = os.environ.get("DARIA_LAN_IP", "").strip()
+    if env_ip:
+        try:
+            # Goes into the certificate SAN; a typo must not abort setup_ssl
+            return str(ipaddress.ip_address(env_ip))
+        except ValueError:
+            warn(f"DARIA_LAN_IP={env_ip!r} — некорректный IP, определяю автоматически")
     try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        ip = s.getsockname()[0]
-        s.close()
-        return ip
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.settimeout(0.2)
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
     except: return "127.0.0.1"
 
+def _run_quiet(cmd, echo_errors=True, **kw):
+    """Run silently: stdout is discarded, stderr is only kept (and shown) on failure"""
+    r = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, **kw)
+    if r.returncode:
+        if echo_errors and r.stderr:
+            sys.stderr.write(r.stderr.decode('utf-8', 'replace'))
+        raise subprocess.CalledProcessError(r.returncode, cmd, stderr=r.stderr)
+    return r
+
 def get_info():
-    system = platform.system()
     is_admin = False
-    if system != 'Windows':
+    if not IS_WINDOWS:
         try:
             is_admin = os.geteuid() == 0
         except:
             pass
-    return {'system': system, 'is_windows': system == 'Windows', 'is_macos': system == 'Darwin',
+    return {'system': SYSTEM, 'is_windows': IS_WINDOWS, 'is_macos': IS_MACOS,
             'is_admin': is_admin, 'home': Path.home(), 'cwd': Path.cwd()}
 
 def check_python():
@@ -142,31 +177,62 @@ def setup_venv(info):
         ok("Создано")
     else:
         warn("Уже существует")
-    pip = venv / ('Scripts' if info['is_windows'] else 'bin') / ('pip.exe' if info['is_windows'] else 'pip')
-    return pip
+    return venv / ('Scripts' if info['is_windows'] else 'bin') / ('python.exe' if info['is_windows'] else 'python')
 
 
-def get_venv_python(pip_path: Path, is_windows: bool) -> Path:
-    bindir = pip_path.parent
-    py = bindir / ('python.exe' if is_windows else 'python')
-    return py
+def _venv_pip_version(venv_python: Path):
+    """pip version from the venv's pip-*.dist-info folder name: no subprocess, no network"""
+    venv = venv_python.parent.parent
+    for site in (venv / 'Lib' / 'site-packages', *(venv / 'lib').glob('python*/site-packages')):
+        for dist in site.glob('pip-*.dist-info'):
+            try:
+                return tuple(int(x) for x in dist.name[4:-10].split('.')[:2])
+            except ValueError:
+                return None
+    return None
 
-def install_deps(pip, profile):
+def install_deps(venv_python, profile):
     step("Зависимости", "📚")
-    subprocess.run([str(pip), 'install', '--upgrade', 'pip', '-q'], check=True)
-    ok("pip обновлён")
-    if Path('requirements.txt').exists():
+    # 'python -m pip' skips the pip launcher and can upgrade pip itself on Windows
+    pip = [str(venv_python), '-m', 'pip']
+    # Wheels over sdist builds (Pillow, pydub...), no prompts, no version probe.
+    # pip's own wheel cache (~/.cache/pip) already persists between installs.
+    env = os.environ.copy()
+    env.setdefault('PIP_PREFER_BINARY', '1')
+    env.setdefault('PIP_NO_INPUT', '1')
+    env.setdefault('PIP_DISABLE_PIP_VERSION_CHECK', '1')
+    current = _venv_pip_version(venv_python)
+    if current and current >= PIP_MIN_VERSION:
+        ok(f"pip {'.'.join(map(str, current))} актуален")
+    else:
+        _run_quiet([*pip, 'install', '--upgrade', 'pip', '-q'], env=env)
+        ok("pip обновлён")
+    # Base requirements and profile extras go to one pip run: the resolver
+    # walks the dependency graph once and shared packages are fetched once
+    base = ['-r', 'requirements.txt'] if Path('requirements.txt').exists() else []
+    extras = profile.get("extras", [])
+    if not base and not extras:
+        return False
+    cmd = [*pip, 'install', '-q']
+    if extras:
+        info(f"Устанавливаю пакеты ({profile['id']})...")
+    else:
         info("Устанавливаю пакеты...")
-        subprocess.run([str(pip), 'install', '-r', 'requirements.txt', '-q'], check=True)
+    try:
+        _run_quiet([*cmd, *base, *extras], env=env)
+    except subprocess.CalledProcessError as e:
+        if not extras:
+            raise
+        # Extras are optional: retry the base set alone so the core still installs
+        warn(f"Часть дополнительных зависимостей не установилась: {e}")
+        if base:
+            _run_quiet([*cmd, *base], env=env)
+            ok("Базовые зависимости установлены")
+        return False
+    if base:
         ok("Базовые зависимости установлены")
-    extras = profile.get("extras", [])
     if extras:
-        info(f"Устанавливаю дополнительные пакеты ({profile['id']})...")
-        try:
-            subprocess.run([str(pip), 'install', *extras, '-q'], check=True)
-            ok("Дополнительные зависимости установлены")
-        except subprocess.CalledProcessError as e:
-            warn(f"Часть дополнительных зависимостей не установилась: {e}")
+        ok("Дополнительные зависимости установлены")
     return False
 
 
@@ -205,25 +271,128 @@ def preload_models(venv_python: Path, profile: Dict[str, Any]):
 def setup_dirs(info):
     step("Директории", "📁")
     d = info['home'] / '.daria'
-    for sub in ['plugins', 'data', 'uploads', 'files', 'ssl', 'chats', 'learning', 'memory']:
-        (d / sub).mkdir(parents=True, exist_ok=True)
+    base = str(d)
+    os.makedirs(base, exist_ok=True)
+    # One mkdir syscall per leaf; an existing dir is the only expected error
+    for sub in ('plugins', 'data', 'uploads', 'files', 'ssl', 'chats', 'learning', 'memory'):
+        try:
+            os.mkdir(base + os.sep + sub)
+        except FileExistsError:
+            pass
     ok(f"{d}")
     return d
 
-def setup_ssl(info, daria_dir):
+def _cert_is_fresh(cert: Path, key: Path) -> bool:
+    """Both files present, non-empty and not older than the certificate lifetime"""
+    try:
+        cert_st, key_st = cert.stat(), key.stat()
+    except OSError:
+        return False
+    age_days = (time.time() - cert_st.st_mtime) / 86400
+    return cert_st.st_size > 0 and key_st.st_size > 0 and age_days < SSL_CERT_DAYS - 1
+
+def _cert_has_ip(cert: Path, ip: str) -> bool:
+    """Whether the certificate's SAN covers ip; True when it can't be checked"""
+    try:
+        from cryptography import x509
+    except ImportError:
+        if not shutil.which('openssl'):
+            return True
+        r = subprocess.run(['openssl', 'x509', '-in', str(cert), '-noout', '-text'],
+                           capture_output=True, text=True)
+        if r.returncode != 0:
+            return True
+        target = ipaddress.ip_address(ip)
+        for line in r.stdout.splitlines():
+            for part in line.split(','):
+                name, _, value = part.strip().partition(':')
+                try:
+                    if name == "IP Address" and ipaddress.ip_address(value) == target:
+                        return True
+                except ValueError:
+                    continue
+        return False
+    try:
+        san = x509.load_pem_x509_certificate(cert.read_bytes()).extensions.get_extension_for_class(
+            x509.SubjectAlternativeName).value
+    except (OSError, ValueError, x509.ExtensionNotFound):
+        return False
+    return ipaddress.ip_address(ip) in san.get_values_for_type(x509.IPAddress)
+
+def _generate_cert(cert: Path, key: Path, ip: str, use_rsa: bool = False) -> bool:
+    """Self-signed cert in-process via cryptography; False if the package is missing"""
+    try:
+        from cryptography import x509
+        from cryptography.x509.oid import NameOID
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import ec, rsa
+    except ImportError:
+        return False
+    import datetime
+
+    # P-256: keygen is near-instant and ECDSA handshakes are much cheaper than RSA-2048
+    if use_rsa:
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "DARIA")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    san = x509.SubjectAlternativeName([
+        x509.DNSName("localhost"),
+        x509.DNSName(LOCAL_DOMAIN),
+        x509.IPAddress(ipaddress.ip_address("127.0.0.1")),
+        x509.IPAddress(ipaddress.ip_address(ip)),
+    ])
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(private_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=SSL_CERT_DAYS))
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=False)
+        .add_extension(x509.KeyUsage(
+            digital_signature=True, key_encipherment=use_rsa, content_commitment=False,
+            data_encipherment=False, key_agreement=False, key_cert_sign=False,
+            crl_sign=False, encipher_only=False, decipher_only=False,
+        ), critical=False)
+        .add_extension(san, critical=False)
+        .sign(private_key, hashes.SHA256())
+    )
+
+    # Private key is created owner-only, like openssl -keyout does
+    fd = os.open(key, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+    cert.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    return True
+
+def setup_ssl(info, daria_dir, force=False, use_rsa=False):
     step("SSL сертификат", "🔐")
     ssl_dir = daria_dir / 'ssl'
     cert, key = ssl_dir / 'cert.pem', ssl_dir / 'key.pem'
 
-    if cert.exists() and key.exists():
-        warn("Уже существует")
-        try:
-            answer = input(f"  {C.CYAN}Перегенерировать? [y/N]: {C.END}").strip().lower()
-        except (EOFError, KeyboardInterrupt):
-            answer = 'n'
-        if answer != 'y':
-            ok("Оставлено без изменений")
-            return True
+    ip = get_ip()
+    fresh = not force and _cert_is_fresh(cert, key)
+    # Reinstalls keep a valid certificate without prompting or running openssl,
+    # unless the LAN IP changed and is no longer in its SAN
+    if fresh and _cert_has_ip(cert, ip):
+        ok("Уже настроен (перегенерация: --force-ssl)")
+        return True
+
+    if cert.exists() or key.exists():
+        if force:
+            info_msg = "Перегенерирую"
+        elif fresh:
+            info_msg = f"IP {ip} нет в сертификате, перегенерирую"
+        else:
+            info_msg = "Сертификат устарел или повреждён, перегенерирую"
+        print(f"  {C.CYAN}ℹ {info_msg}{C.END}")
         # Remove old certs before regenerating (FIXED: Point #9)
         try:
             if cert.exists():
@@ -234,17 +403,24 @@ def setup_ssl(info, daria_dir):
             err(f"Не удалось удалить старые сертификаты: {e}")
             return False
 
+    info_msg = f"IP: {ip}"
+    print(f"  {C.CYAN}ℹ {info_msg}{C.END}")
+
+    try:
+        if _generate_cert(cert, key, ip, use_rsa):
+            ok("Создан")
+            return True
+    except Exception as e:
+        err(f"Ошибка: {e}")
+        return False
+
+    # No cryptography package in this interpreter: fall back to the openssl CLI
     if not shutil.which('openssl'):
         warn("OpenSSL не найден")
         return False
 
-    ip = get_ip()
-    info_msg = f"IP: {ip}"
-    print(f"  {C.CYAN}ℹ {info_msg}{C.END}")
-
     cfg = ssl_dir / 'openssl.cnf'
     cfg.write_text(f"""[req]
-default_bits = 2048
 prompt = no
 default_md = sha256
 distinguished_name = dn
@@ -255,7 +431,7 @@ CN = DARIA
 
 [v3_req]
 basicConstraints = CA:TRUE
-keyUsage = digitalSignature, keyEncipherment
+keyUsage = {'digitalSignature, keyEncipherment' if use_rsa else 'digitalSignature'}
 subjectAltName = @alt_names
 
 [alt_names]
@@ -266,9 +442,10 @@ IP.2 = {ip}
 """)
 
     try:
-        result = subprocess.run(['openssl', 'req', '-x509', '-nodes', '-days', '365', '-newkey', 'rsa:2048',
-                       '-keyout', str(key), '-out', str(cert), '-config', str(cfg)],
-                      check=True, capture_output=True, text=True)
+        newkey = ['-newkey', 'rsa:2048'] if use_rsa else ['-newkey', 'ec', '-pkeyopt', 'ec_paramgen_curve:prime256v1']
+        _run_quiet(['openssl', 'req', '-x509', '-nodes', '-days', str(SSL_CERT_DAYS), *newkey,
+                    '-keyout', str(key), '-out', str(cert), '-config', str(cfg)],
+                   echo_errors=False)
         try:
             cfg.unlink()
         except:
@@ -276,7 +453,7 @@ IP.2 = {ip}
         ok("Создан")
         return True
     except subprocess.CalledProcessError as e:
-        err(f"Ошибка OpenSSL: {e.stderr[:100] if e.stderr else 'unknown'}")
+        err(f"Ошибка OpenSSL: {e.stderr[:100].decode('utf-8', 'replace') if e.stderr else 'unknown'}")
         # Cleanup on failure
         try:
             cfg.unlink()
@@ -295,18 +472,55 @@ def check_ollama():
     ok("Найдена")
     return True
 
+def _sync_file(src, dst):
+    """copytree copy_function: skip unchanged files, copy the rest"""
+    try:
+        s, d = os.stat(src), os.stat(dst)
+        if s.st_size == d.st_size and s.st_mtime_ns == d.st_mtime_ns:
+            return dst
+        # Replace instead of writing into dst: older installs hardlinked it to the source
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    return shutil.copy2(src, dst)
+
+# Runtime state inside an installed plugin that a sync must never prune
+_PLUGIN_KEEP = {'data', 'venv', '__pycache__', 'plugin.manifest.json'}
+
+def _prune_plugin(src, dst, top=True):
+    """Delete files and folders in dst that are gone from src (except runtime state)"""
+    with os.scandir(dst) as entries:
+        for e in entries:
+            if (top and e.name in _PLUGIN_KEEP) or e.name == '__pycache__':
+                continue
+            s = os.path.join(src, e.name)
+            if e.is_dir(follow_symlinks=False):
+                if os.path.isdir(s):
+                    _prune_plugin(s, e.path, top=False)
+                else:
+                    shutil.rmtree(e.path, ignore_errors=True)
+            elif not os.path.isfile(s):
+                os.unlink(e.path)
+
 def install_plugins(daria_dir):
     step("Плагины", "🧩")
     src, dst = Path('plugins'), daria_dir / 'plugins'
     count = 0
-    if src.exists():
-        for p in src.iterdir():
-            if p.is_dir() and (p / 'plugin.yaml').exists():
-                d = dst / p.name
-                if d.exists(): shutil.rmtree(d)
-                shutil.copytree(p, d)
-                ok(p.name)
-                count += 1
+    try:
+        with os.scandir(src) as entries:
+            plugin_dirs = [e for e in entries if e.is_dir()]
+    except FileNotFoundError:
+        plugin_dirs = []
+    for entry in plugin_dirs:
+        p = Path(entry.path)
+        if (p / 'plugin.json').exists() or (p / 'plugin.yaml').exists():
+            # Incremental: only new or changed files are copied, files removed
+            # upstream are pruned, the plugin's data/ and venv/ are kept
+            shutil.copytree(p, dst / entry.name, dirs_exist_ok=True, copy_function=_sync_file,
+                            ignore=shutil.ignore_patterns('__pycache__'))
+            _prune_plugin(p, dst / entry.name)
+            ok(entry.name)
+            count += 1
     if count == 0:
         info("Нет плагинов для установки")
 
@@ -370,41 +584,46 @@ def configure_autostart(nfo, use_tray=False):
     return True
 
 
+def _write_script(path: Path, content: str, executable: bool):
+    """open(mode)+write+close, no TextIOWrapper; the mode is re-applied for existing files"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0),
+                 0o755 if executable else 0o644)
+    try:
+        os.write(fd, content.encode('utf-8'))
+        if executable and hasattr(os, 'fchmod'):
+            os.fchmod(fd, 0o755)
+    finally:
+        os.close(fd)
+
+
 def create_scripts(info, daria_dir):
     step("Скрипты запуска", "🚀")
     cert, key = daria_dir / 'ssl' / 'cert.pem', daria_dir / 'ssl' / 'key.pem'
 
     if info['is_windows']:
-        Path('start.bat').write_text(
-            f'@echo off\ncall venv\\Scripts\\activate\npython main.py --port {DEFAULT_PORT} %*\n',
-            encoding='utf-8')
-        ok("start.bat")
-        Path('start-tray.bat').write_text(
-            f'@echo off\ncall venv\\Scripts\\activate\npython main.py --tray --port {DEFAULT_PORT} %*\n',
-            encoding='utf-8')
-        ok("start-tray.bat")
+        # Written in binary mode, so CRLF is spelled out for cmd.exe
+        head = '@echo off\r\ncall venv\\Scripts\\activate\r\n'
+        scripts = [
+            ('start.bat', f'{head}python main.py --port {DEFAULT_PORT} %*\r\n'),
+            ('start-tray.bat', f'{head}python main.py --tray --port {DEFAULT_PORT} %*\r\n'),
+        ]
         if cert.exists():
-            Path('start-https.bat').write_text(
-                f'@echo off\ncall venv\\Scripts\\activate\n'
-                f'python main.py --ssl --ssl-cert "{cert}" --ssl-key "{key}" --host 0.0.0.0 --port {DEFAULT_PORT} %*\n',
-                encoding='utf-8')
-            ok("start-https.bat")
+            scripts.append(('start-https.bat',
+                f'{head}python main.py --ssl --ssl-cert "{cert}" --ssl-key "{key}" --host 0.0.0.0 --port {DEFAULT_PORT} %*\r\n'))
     else:
-        s = Path('start.sh')
-        s.write_text(f'#!/bin/bash\nsource venv/bin/activate\npython main.py --port {DEFAULT_PORT} "$@"\n')
-        s.chmod(0o755)
-        ok("start.sh")
-        t = Path('start-tray.sh')
-        t.write_text(f'#!/bin/bash\nsource venv/bin/activate\npython main.py --tray --port {DEFAULT_PORT} "$@"\n')
-        t.chmod(0o755)
-        ok("start-tray.sh")
+        head = '#!/bin/bash\nsource venv/bin/activate\n'
+        scripts = [
+            ('start.sh', f'{head}python main.py --port {DEFAULT_PORT} "$@"\n'),
+            ('start-tray.sh', f'{head}python main.py --tray --port {DEFAULT_PORT} "$@"\n'),
+        ]
         if cert.exists():
-            h = Path('start-https.sh')
-            h.write_text(
-                f'#!/bin/bash\nsource venv/bin/activate\n'
-                f'python main.py --ssl --ssl-cert "{cert}" --ssl-key "{key}" --host 0.0.0.0 --port {DEFAULT_PORT} "$@"\n')
-            h.chmod(0o755)
-            ok("start-https.sh")
+            scripts.append(('start-https.sh',
+                f'{head}python main.py --ssl --ssl-cert "{cert}" --ssl-key "{key}" --host 0.0.0.0 --port {DEFAULT_PORT} "$@"\n'))
+
+    executable = not info['is_windows']
+    for name, content in scripts:
+        _write_script(Path(name), content, executable)
+        ok(name)
 
 def save_install_config(daria_dir, profile_id: str, autostart: bool, tray_default: bool):
     cfg = {
@@ -417,52 +636,70 @@ def save_install_config(daria_dir, profile_id: str, autostart: bool, tray_defaul
     (daria_dir / "install_config.json").write_text(json.dumps(cfg, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
-def print_final(info, daria_dir, profile_id: str, autostart_enabled: bool, tray_default: bool):
-    ssl_ok = (daria_dir / 'ssl' / 'cert.pem').exists()
-    ip = get_ip()
-    cmd = "start.bat" if info['is_windows'] else "./start.sh"
-    tray_cmd = "start-tray.bat" if info['is_windows'] else "./start-tray.sh"
-    hcmd = "start-https.bat" if info['is_windows'] else "./start-https.sh"
-
-    print(f"""
+# print_final frame: colors/version/port are baked in once, per-install values
+# are filled with a single format_map() call
+_FINAL_HEAD = f"""
 {C.PINK}{C.BOLD}
   ╭────────────────────────────────────────────────────────╮
   │      ♥  Установка DARIA v{VERSION} завершена!  ♥           │
   ├────────────────────────────────────────────────────────┤
   │                                                        │
-  │  {C.GREEN}Запуск:{C.PINK}  {C.CYAN}{cmd:<46}{C.PINK}│
-  │  {C.GREEN}Трей:{C.PINK}    {C.CYAN}{tray_cmd:<46}{C.PINK}│""")
-
-    if ssl_ok:
-        print(f"""  │  {C.GREEN}HTTPS:{C.PINK}   {C.CYAN}{hcmd:<46}{C.PINK}│
+  │  {C.GREEN}Запуск:{C.PINK}  {C.CYAN}{{cmd:<46}}{C.PINK}│
+  │  {C.GREEN}Трей:{C.PINK}    {C.CYAN}{{tray_cmd:<46}}{C.PINK}│
+"""
+_FINAL_SSL = f"""  │  {C.GREEN}HTTPS:{C.PINK}   {C.CYAN}{{hcmd:<46}}{C.PINK}│
   │                                                        │
   │  {C.YELLOW}Адреса:{C.PINK}                                              │
   │    {C.CYAN}http://localhost:{DEFAULT_PORT}{C.PINK}                               │
-  │    {C.CYAN}https://{ip}:{DEFAULT_PORT}{C.PINK}                             │""")
-
-    print(f"""  │                                                        │
-  │  {C.YELLOW}Профиль:{C.PINK} {profile_id:<38}│
-  │  {C.YELLOW}Автозапуск:{C.PINK} {"включён" if autostart_enabled else "выключен":<35}│
-  │  {C.YELLOW}Трей по умолчанию:{C.PINK} {"да" if tray_default else "нет":<28}│
+  │    {C.CYAN}https://{{ip}}:{DEFAULT_PORT}{C.PINK}                             │
+"""
+_FINAL_TAIL = f"""  │                                                        │
+  │  {C.YELLOW}Профиль:{C.PINK} {{profile_id:<38}}│
+  │  {C.YELLOW}Автозапуск:{C.PINK} {{autostart:<35}}│
+  │  {C.YELLOW}Трей по умолчанию:{C.PINK} {{tray:<28}}│
   │                                                        │
   ├────────────────────────────────────────────────────────┤
   │  {C.YELLOW}Ollama:{C.PINK}  ollama serve                                │
   │  {C.YELLOW}Модель:{C.PINK}  ollama pull llama3.1:8b-instruct-q4_K_M     │
   ╰────────────────────────────────────────────────────────╯
-{C.END}""")
+{C.END}
+"""
+
+def print_final(info, daria_dir, profile_id: str, autostart_enabled: bool, tray_default: bool):
+    ssl_ok = (daria_dir / 'ssl' / 'cert.pem').exists()
+    win = info['is_windows']
+    fields = {
+        'cmd': "start.bat" if win else "./start.sh",
+        'tray_cmd': "start-tray.bat" if win else "./start-tray.sh",
+        'hcmd': "start-https.bat" if win else "./start-https.sh",
+        'ip': get_ip() if ssl_ok else "",
+        'profile_id': profile_id,
+        'autostart': "включён" if autostart_enabled else "выключен",
+        'tray': "да" if tray_default else "нет",
+    }
+    template = _FINAL_HEAD + _FINAL_SSL + _FINAL_TAIL if ssl_ok else _FINAL_HEAD + _FINAL_TAIL
+    sys.stdout.write(template.format_map(fields))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Установщик DARIA")
+    parser.add_argument('--force-ssl', action='store_true',
+                        help="перегенерировать SSL-сертификат, даже если текущий действителен")
+    parser.add_argument('--rsa', action='store_true',
+                        help="ключ сертификата RSA-2048 вместо ECDSA P-256 (для старых клиентов)")
+    return parser.parse_args(argv)
 
 def main():
+    args = parse_args()
     banner()
     nfo = get_info()
     os_name = "Windows" if nfo['is_windows'] else ("macOS" if nfo['is_macos'] else "Linux")
-    print(f"  {C.CYAN}ℹ Система: {os_name} ({platform.machine()}){C.END}")
+    print(f"  {C.CYAN}ℹ Система: {os_name} ({MACHINE}){C.END}")
 
     if not check_python(): sys.exit(1)
 
     profile = choose_install_profile()
-    pip = setup_venv(nfo)
-    venv_python = get_venv_python(pip, nfo['is_windows'])
-    install_deps(pip, profile)
+    venv_python = setup_venv(nfo)
+    install_deps(venv_python, profile)
     preload_models(venv_python, profile)
     daria_dir = setup_dirs(nfo)
 
@@ -472,7 +709,7 @@ def main():
         ssl_answer = 'n'
 
     if ssl_answer != 'n':
-        setup_ssl(nfo, daria_dir)
+        setup_ssl(nfo, daria_dir, force=args.force_ssl, use_rsa=args.rsa)
 
     try:
         tray_ans = input(f"\n{C.CYAN}🪟 Использовать трей по умолчанию в скриптах? [Y/n]: {C.END}").strip().lower()
@@ -5,16 +5,13 @@
 
 import sys
 import os
-import argparse
-import logging
-import threading
-import platform
 import time
-import webbrowser
-import json
-import subprocess
 from pathlib import Path
 from typing import Optional
+from functools import lru_cache
+
+# argparse, logging, threading, subprocess and webbrowser are imported where
+# they are used, so `--version` and the tray self-detach stay cheap
 
 # Disable Flask logs
 import warnings
@@ -98,15 +95,18 @@ HEART_FRAMES = [
     ],
 ]
 
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
-
-def print_heart_frame(frame_idx, message="", color=None):
-    """Print a single heart frame centered"""
-    if color is None:
-        colors = [c.PINK, c.RED, c.PURPLE, c.PINK]
-        color = colors[frame_idx % len(colors)]
+# Same sequence `clear` emits: cursor home, clear screen, clear scrollback
+_CLEAR_SEQ = "\033[H\033[2J\033[3J"
 
+def clear_screen():
+    if os.name == 'nt':
+        os.system('cls')
+    elif sys.stdout.isatty():
+        sys.stdout.write(_CLEAR_SEQ)
+        sys.stdout.flush()
+
+def _render_heart_head(frame_idx, color):
+    """Frame part above the status line: separator, heart, name and version"""
     frame = HEART_FRAMES[frame_idx % len(HEART_FRAMES)]
     width = 60
 
@@ -123,24 +123,40 @@ def print_heart_frame(frame_idx, message="", color=None):
     lines.append(f"  {c.WHITE}{c.BOLD}{'DARIA'.center(width)}{c.END}")
     lines.append(f"  {c.GRAY}{'v' + VERSION + ' • AI Desktop Companion'.center(width)}{c.END}")
     lines.append("")
+    return '\n'.join(lines) + '\n'
 
-    if message:
-        lines.append(f"  {c.CYAN}{message.center(width)}{c.END}")
-    else:
-        lines.append(f"  {c.GRAY}{'Загрузка...'.center(width)}{c.END}")
+# Heart frames only change in their status line, so the rest is rendered once
+_HEART_COLORS = (c.PINK, c.RED, c.PURPLE, c.PINK)
+_HEART_HEADS = tuple(
+    _render_heart_head(i, _HEART_COLORS[i % len(_HEART_COLORS)]) for i in range(len(HEART_FRAMES))
+)
+_HEART_FOOTER = f"\n{c.GRAY}{'─' * 60}{c.END}"
 
-    lines.append(f"{c.GRAY}{'─' * width}{c.END}")
+def print_heart_frame(frame_idx, message="", color=None):
+    """Print a single heart frame centered"""
+    if color is None:
+        head = _HEART_HEADS[frame_idx % len(_HEART_HEADS)]
+    else:
+        head = _render_heart_head(frame_idx, color)
 
-    return '\n'.join(lines)
+    if message:
+        status = f"  {c.CYAN}{message.center(60)}{c.END}"
+    else:
+        status = f"  {c.GRAY}{'Загрузка...'.center(60)}{c.END}"
+    return head + status + _HEART_FOOTER
 
 
 def animate_loading(stop_event, status_ref):
     """Animate pulsating heart during loading"""
     frame = 0
+    clear = _CLEAR_SEQ if os.name != 'nt' and sys.stdout.isatty() else ""
     while not stop_event.is_set():
-        clear_screen()
         msg = status_ref.get("message", "Загрузка...")
-        print(print_heart_frame(frame, msg))
+        if os.name == 'nt':
+            clear_screen()
+        # Clear + frame in one write: no `clear` process and no flicker between them
+        sys.stdout.write(clear + print_heart_frame(frame, msg) + "\n")
+        sys.stdout.flush()
         frame = (frame + 1) % len(HEART_FRAMES)
         time.sleep(0.5)
 
@@ -235,13 +251,34 @@ def send_os_notification(title: str, message: str):
 
 def get_os_type() -> str:
     """Determine OS type"""
-    system = platform.system().lower()
-    if system == 'darwin':
+    if sys.platform == 'darwin':
         return 'macos'
-    elif system == 'windows':
+    elif sys.platform == 'win32':
         return 'windows'
     return 'linux'
 
+@lru_cache(maxsize=1)
+def get_local_ip() -> Optional[str]:
+    """LAN address for the startup banner; DARIA_LAN_IP skips the socket probe"""
+    env_ip = os.environ.get("DARIA_LAN_IP", "").strip()
+    if env_ip:
+        import ipaddress
+        try:
+            return str(ipaddress.ip_address(env_ip))
+        except ValueError:
+            import logging
+            logging.getLogger('daria').warning(
+                f"DARIA_LAN_IP={env_ip!r} — некорректный IP, определяю автоматически"
+            )
+    import socket
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.settimeout(0.2)
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
+    except OSError:
+        return None
+
 def setup_server_env(os_type: str):
     """Setup environment variables based on OS"""
     cpu_threads = max(2, min(6, int((os.cpu_count() or 4) / 2)))
@@ -291,20 +328,22 @@ def run_with_server(app_module, host, port, debug, ssl_context, os_type):
 #  Logger
 # ═══════════════════════════════════════════════════════════════════
 
-class ColoredFormatter(logging.Formatter):
-    COLORS = {
-        'DEBUG': c.GRAY, 'INFO': c.GREEN,
-        'WARNING': c.YELLOW, 'ERROR': c.RED
-    }
-    ICONS = {'DEBUG': '🔍', 'INFO': '✨', 'WARNING': '⚠️', 'ERROR': '❌'}
+def setup_logging(debug: bool = False, trace: bool = False):
+    import logging
 
-    def format(self, record):
-        color = self.COLORS.get(record.levelname, '')
-        icon = self.ICONS.get(record.levelname, '')
-        time_str = self.formatTime(record, '%H:%M:%S')
-        return f"{color}{icon} [{time_str}] {record.getMessage()}{c.END}"
+    class ColoredFormatter(logging.Formatter):
+        COLORS = {
+            'DEBUG': c.GRAY, 'INFO': c.GREEN,
+            'WARNING': c.YELLOW, 'ERROR': c.RED
+        }
+        ICONS = {'DEBUG': '🔍', 'INFO': '✨', 'WARNING': '⚠️', 'ERROR': '❌'}
+
+        def format(self, record):
+            color = self.COLORS.get(record.levelname, '')
+            icon = self.ICONS.get(record.levelname, '')
+            time_str = self.formatTime(record, '%H:%M:%S')
+            return f"{color}{icon} [{time_str}] {record.getMessage()}{c.END}"
 
-def setup_logging(debug: bool = False, trace: bool = False):
     logging.getLogger('werkzeug').setLevel(logging.ERROR)
     logging.getLogger('flask').setLevel(logging.ERROR)
 
@@ -341,48 +380,58 @@ def setup_logging(debug: bool = False, trace: bool = False):
 #  System Check
 # ═══════════════════════════════════════════════════════════════════
 
-def check_system():
-    print(f"\n  {c.CYAN}🔍 Проверка системы...{c.END}\n")
-
-    checks = []
-    py_ver = f"{sys.version_info.major}.{sys.version_info.minor}"
-    checks.append(('Python', py_ver, sys.version_info >= (3, 10)))
-
-    os_type = get_os_type()
-    checks.append(('ОС', f"{platform.system()} ({os_type})", True))
-
+def _check_config():
     try:
         from core.config import get_config
-        config = get_config()
-        checks.append(('Конфигурация', '✓', True))
+        get_config()
+        return ('Конфигурация', '✓', True)
     except Exception as e:
-        checks.append(('Конфигурация', str(e)[:30], False))
+        return ('Конфигурация', str(e)[:30], False)
 
+def _check_ollama():
     try:
         from core.llm import get_llm
-        llm = get_llm()
-        status = llm.check_availability()
+        status = get_llm().check_availability()
         if status.get('available'):
             model = '✓' if status.get('model_loaded') else 'Нет модели'
-            checks.append(('Ollama', model, status.get('model_loaded', False)))
-        else:
-            checks.append(('Ollama', 'Недоступна', False))
+            return ('Ollama', model, status.get('model_loaded', False))
+        return ('Ollama', 'Недоступна', False)
     except Exception as e:
-        checks.append(('Ollama', str(e)[:30], False))
+        return ('Ollama', str(e)[:30], False)
 
+def _check_memory():
     try:
         from core.memory import get_memory
-        memory = get_memory()
-        stats = memory.get_stats()
-        checks.append(('Память', f"{stats.get('facts', 0)} фактов", True))
+        stats = get_memory().get_stats()
+        return ('Память', f"{stats.get('facts', 0)} фактов", True)
     except Exception as e:
-        checks.append(('Память', str(e)[:30], False))
+        return ('Память', str(e)[:30], False)
 
-    try:
-        from plyer import notification
-        checks.append(('Plyer (уведомления)', '✓', True))
-    except:
-        checks.append(('Plyer', 'Не установлен', False))
+def _check_plyer():
+    # Presence is enough here, importing plyer would load its platform backends
+    import importlib.util
+    if importlib.util.find_spec('plyer') is not None:
+        return ('Plyer (уведомления)', '✓', True)
+    return ('Plyer', 'Не установлен', False)
+
+def check_system():
+    from concurrent.futures import ThreadPoolExecutor
+
+    print(f"\n  {c.CYAN}🔍 Проверка системы...{c.END}\n")
+
+    checks = []
+    py_ver = f"{sys.version_info.major}.{sys.version_info.minor}"
+    checks.append(('Python', py_ver, sys.version_info >= (3, 10)))
+
+    os_type = get_os_type()
+    system = os.uname().sysname if hasattr(os, 'uname') else 'Windows'
+    checks.append(('ОС', f"{system} ({os_type})", True))
+
+    # Config first: the other probes share its singleton
+    checks.append(_check_config())
+    # Ollama round-trip, memory DB and plyer lookup overlap; map() keeps display order
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        checks.extend(ex.map(lambda probe: probe(), (_check_ollama, _check_memory, _check_plyer)))
 
     for name, value, ok in checks:
         status = f"{c.GREEN}✓{c.END}" if ok else f"{c.YELLOW}○{c.END}"
@@ -394,6 +443,7 @@ def check_system():
 # ═══════════════════════════════════════════════════════════════════
 
 def run_server(host: str, port: int, debug: bool, ssl_context, trace: bool = False):
+    import threading
     logger = setup_logging(debug, trace=trace)
     os_type = get_os_type()
     setup_server_env(os_type)
@@ -430,29 +480,30 @@ def run_server(host: str, port: int, debug: bool, ssl_context, trace: bool = Fal
     # Print final startup info (pinned at top, logs below)
     protocol = 'https' if ssl_context else 'http'
 
-    print(f"\n  {c.PINK}{'─' * 58}{c.END}")
-    print(f"  {c.PINK}♥{c.END}  {c.BOLD}{c.WHITE}DARIA v{VERSION}{c.END} — {c.CYAN}AI Desktop Companion{c.END}  {c.PINK}♥{c.END}")
-    print(f"  {c.PINK}{'─' * 58}{c.END}")
-    print()
-    print(f"  {c.GREEN}✨ DARIA готова!{c.END}  |  {c.GRAY}ОС: {os_type}{c.END}")
-    print()
-    print(f"    {c.WHITE}Локально:{c.END}  {c.CYAN}{protocol}://localhost:{port}{c.END}")
+    lines = [
+        f"\n  {c.PINK}{'─' * 58}{c.END}",
+        f"  {c.PINK}♥{c.END}  {c.BOLD}{c.WHITE}DARIA v{VERSION}{c.END} — {c.CYAN}AI Desktop Companion{c.END}  {c.PINK}♥{c.END}",
+        f"  {c.PINK}{'─' * 58}{c.END}",
+        "",
+        f"  {c.GREEN}✨ DARIA готова!{c.END}  |  {c.GRAY}ОС: {os_type}{c.END}",
+        "",
+        f"    {c.WHITE}Локально:{c.END}  {c.CYAN}{protocol}://localhost:{port}{c.END}",
+    ]
 
     if host == '0.0.0.0':
-        import socket
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            local_ip = s.getsockname()[0]
-            s.close()
-            print(f"    {c.WHITE}Сеть:{c.END}      {c.CYAN}{protocol}://{local_ip}:{port}{c.END}")
-        except:
-            pass
+        local_ip = get_local_ip()
+        if local_ip:
+            lines.append(f"    {c.WHITE}Сеть:{c.END}      {c.CYAN}{protocol}://{local_ip}:{port}{c.END}")
 
-    print()
-    print(f"    {c.GRAY}Нажми Ctrl+C для остановки{c.END}")
-    print(f"  {c.PINK}{'─' * 58}{c.END}")
-    print()
+    lines += [
+        "",
+        f"    {c.GRAY}Нажми Ctrl+C для остановки{c.END}",
+        f"  {c.PINK}{'─' * 58}{c.END}",
+        "",
+    ]
+    # One write for the whole block, so log lines from other threads can't split it
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
     send_os_notification("🌸 DARIA", "Я запустилась и готова к общению!")
 
@@ -498,6 +549,9 @@ def set_autostart(enabled: bool, host: str = "127.0.0.1", port: int = 7777):
 
 
 def run_tray(host: str, port: int, debug: bool, ssl_context, trace: bool = False):
+    import subprocess
+    import threading
+    import webbrowser
     setup_logging(debug, trace=trace)
     if sys.platform.startswith("linux"):
         # Do not hard-force appindicator: on some DE/Wayland setups it breaks context menu behavior.
@@ -630,6 +684,12 @@ def run_tray(host: str, port: int, debug: bool, ssl_context, trace: bool = False
 # ═══════════════════════════════════════════════════════════════════
 
 def main():
+    # Fast path: no argparse import for a bare version query
+    if sys.argv[1:] == ['--version']:
+        print(f"DARIA v{VERSION}")
+        return
+
+    import argparse
     parser = argparse.ArgumentParser(
         description='🌸 DARIA - AI Desktop Companion',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -698,6 +758,7 @@ def main():
                 cmd.extend(["--ssl-cert", args.ssl_cert])
             if args.ssl_key:
                 cmd.extend(["--ssl-key", args.ssl_key])
+            import subprocess
             with open(TRAY_LOG_FILE, "a", encoding="utf-8") as logf:
                 subprocess.Popen(
                     cmd,
@@ -1,9 +1,14 @@
+import sqlite3
+import sys
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 
-from core.memory import WorkingMemory
-from core.plugins import PluginAPI
+from core.memory import LongTermMemory, Memory, MemoryType, WorkingMemory
+from core.plugins import (
+    HOOK_METHODS, PLUGIN_RETRY_INTERVAL, PluginAPI, PluginManager, PluginManifest, PluginState,
+)
 from web import app as web_app
 
 
@@ -16,6 +21,106 @@ class TestV081Regressions(unittest.TestCase):
             self.assertIn("Пользователь:", summary)
             self.assertIn("Даша:", summary)
 
+    def test_working_memory_flush_persists_debounced_turns(self):
+        with tempfile.TemporaryDirectory() as td:
+            wm = WorkingMemory(Path(td), max_turns=10)
+            wm.add_turn("раз", "два")
+            wm.add_turn("три", "четыре")
+            wm.flush()
+            reloaded = WorkingMemory(Path(td), max_turns=10)
+            self.assertEqual(len(reloaded.turns), 2)
+            self.assertEqual(reloaded.turns[-1].user_message, "три")
+
+    def test_working_memory_readers_survive_concurrent_add_turn(self):
+        with tempfile.TemporaryDirectory() as td:
+            wm = WorkingMemory(Path(td), max_turns=50)
+            errors = []
+            stop = threading.Event()
+
+            def write():
+                for i in range(2000):
+                    wm.add_turn(f"вопрос {i}", f"ответ {i}")
+                stop.set()
+
+            def read():
+                try:
+                    while not stop.is_set():
+                        wm.recent_turns(10)
+                        wm.get_messages_for_llm(10)
+                        wm.get_conversation_summary()
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=write) for _ in range(2)]
+            threads += [threading.Thread(target=read) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            wm.flush()
+            self.assertEqual(errors, [])
+
+    def test_long_term_memory_fts_survives_legacy_schema_and_vacuum(self):
+        with tempfile.TemporaryDirectory() as td:
+            conn = sqlite3.connect(Path(td) / "memory.db")
+            conn.execute(
+                "CREATE TABLE memories (id TEXT PRIMARY KEY, content TEXT, type TEXT, importance REAL, "
+                "created_at TEXT, last_accessed TEXT, access_count INTEGER, tags TEXT)"
+            )
+            conn.executemany(
+                "INSERT INTO memories VALUES (?, ?, 'semantic', 0.5, '2024-01-01T10:00:00', "
+                "'2024-01-01T10:00:00', 0, '[]')",
+                [("a", "кошка любит молоко"), ("b", "собака гуляет")],
+            )
+            conn.commit()
+            conn.close()
+
+            ltm = LongTermMemory(Path(td))
+            try:
+                self.assertEqual([m.id for m in ltm.search("кошка")], ["a"])
+                ltm._conn.execute("DELETE FROM memories WHERE id = 'a'")
+                ltm._conn.execute("VACUUM")
+                ltm.store(Memory(id="c", content="попугай говорит", memory_type=MemoryType.SEMANTIC))
+                self.assertEqual([m.id for m in ltm.search("собака")], ["b"])
+                self.assertEqual([m.id for m in ltm.search("попугай")], ["c"])
+                ltm._conn.execute("INSERT INTO memories_fts(memories_fts) VALUES ('integrity-check')")
+            finally:
+                ltm.close()
+
+    def test_failed_plugin_load_is_retried(self):
+        with tempfile.TemporaryDirectory() as td:
+            plugin_dir = Path(td) / "flaky"
+            plugin_dir.mkdir()
+            broken = plugin_dir / "broken"
+            broken.touch()
+            (plugin_dir / "main.py").write_text(
+                "from pathlib import Path\n"
+                "from core.plugins import DariaPlugin\n"
+                "if (Path(__file__).parent / 'broken').exists():\n"
+                "    raise ImportError('not yet')\n"
+                "class Plugin(DariaPlugin):\n"
+                "    pass\n",
+                encoding="utf-8",
+            )
+            manager = PluginManager.__new__(PluginManager)
+            manager._plugins = {
+                "flaky": PluginState(manifest=PluginManifest(id="flaky", name="Flaky"), path=plugin_dir),
+            }
+            manager._hooks = {hook_name: {} for hook_name in HOOK_METHODS}
+            manager._hook_dispatch = {}
+            manager._lock = threading.RLock()
+            manager._load_locks = {}
+
+            self.assertIsNone(manager.get_plugin_instance("flaky"))
+            self.assertIsNotNone(manager._plugins["flaky"].error)
+
+            broken.unlink()
+            self.assertIsNone(manager.get_plugin_instance("flaky"))
+            manager._plugins["flaky"].failed_at -= PLUGIN_RETRY_INTERVAL
+            self.assertIsNotNone(manager.get_plugin_instance("flaky"))
+            self.assertIsNone(manager._plugins["flaky"].error)
+            sys.modules.pop("daria_plugins.flaky", None)
+
     def test_plugin_api_get_user_profile_safe(self):
         api = PluginAPI("voice-call", Path("plugins/voice-call"))
         profile = api.get_user_profile()
@@ -2223,6 +2223,18 @@ def _record_shutdown():
 
 atexit.register(_record_shutdown)
 
+
+def _close_llm():
+    try:
+        from core import llm as llm_module
+        if llm_module._llm is not None:
+            llm_module._llm.close()
+    except Exception:
+        pass
+
+
+atexit.register(_close_llm)
+
 # Lazy components
 _brain = None
 _memory = None
@@ -2541,7 +2553,7 @@ def _collect_dasha_abilities() -> List[str]:
         pm = get_plugins()
         if pm:
             for st in pm.get_installed_plugins():
-                if not st.loaded:
+                if not st.enabled:
                     continue
                 caps = getattr(st.manifest, "capabilities", []) or []
                 for cap in caps: